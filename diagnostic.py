@@ -1,4 +1,4 @@
 import scripts.config as config
-print(f"scripts.config.INTERRUPT_REQUESTED: {config.INTERRUPT_REQUESTED}")
+print(f"scripts.config.INTERRUPT_REQUESTED: {config.INTERRUPT_REQUESTED.is_set()}")
 import config as direct_config
-print(f"direct_config.INTERRUPT_REQUESTED: {direct_config.INTERRUPT_REQUESTED}")
+print(f"direct_config.INTERRUPT_REQUESTED: {direct_config.INTERRUPT_REQUESTED.is_set()}")
@@ -11,6 +11,7 @@ Verification layers:
   4. Answerability: AI check that questions can be answered from prior segments
 """
 
+import os
 import sys
 import json
 import re
@@ -27,6 +28,7 @@ from utils.gemini_client import GeminiClient
 
 # ─── Constants ──────────────────────────────────────────────
 ANSI_REGEX = re.compile(r"\[[0-9]{1,2}m|\[[0-9];[0-9]{1,2}m")
+SECTION_FILE_REGEX = re.compile(r"^(\d+\.\d+)-")
 MIN_LEARN_SEGMENTS = 2
 MCAT_PATTERNS_KEYWORDS = {"mcat patterns", "mcat testing patterns", "mcat strategy", "mcat question patterns"}
 
@@ -287,12 +289,14 @@ Return the COMPLETE fixed JSON — every level, every question, every field.
     return fixed
 
 
-def _cleanup_duplicates(directory: Path):
-    """Remove duplicate files for the same section_id, keeping newest."""
+def _cleanup_duplicates(directory: Path) -> list[Path]:
+    """Remove duplicate files for the same section_id, keeping newest.
+    Returns the JSON files left in the directory so callers can skip a re-glob."""
+    all_files = list(directory.glob("*.json"))
     section_files = {}
-    for f in directory.glob("*.json"):
+    for f in all_files:
         # Extract section_id (e.g., "1.2" from "1.2-atomic-mass-vs-weight.json")
-        match = re.match(r"^(\d+\.\d+)-", f.name)
+        match = SECTION_FILE_REGEX.match(f.name)
         if not match:
             continue
         sec_id = match.group(1)
@@ -300,6 +304,7 @@ def _cleanup_duplicates(directory: Path):
             section_files[sec_id] = []
         section_files[sec_id].append(f)
 
+    archived = set()
     for sec_id, files in section_files.items():
         if len(files) <= 1:
             continue
@@ -311,8 +316,19 @@ def _cleanup_duplicates(directory: Path):
         for dup in files[1:]:
             dest = archive_dir / dup.name
             dup.rename(dest)
+            archived.add(dup)
             print(f"    🗑️  Archived duplicate: {dup.name} → .archive/")
 
+    return [f for f in all_files if f not in archived]
+
+
+def _write_json_atomic(out_path: Path, data: dict):
+    """Write JSON to a temp file and rename it over out_path, so an interrupted
+    run never leaves a truncated file behind."""
+    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, out_path)
+
 
 def run_phase8_2(pdf_filename=None, chapter_num=None):
     client = GeminiClient()
@@ -328,10 +344,10 @@ def run_phase8_2(pdf_filename=None, chapter_num=None):
 
         print(f"\n🔍 Auditing {subject}...")
 
-        # Step 0: Clean up duplicate files in structured output
-        _cleanup_duplicates(struct_subj)
+        # Step 0: Clean up duplicate files in structured output (reuses the same scan)
+        struct_files = _cleanup_duplicates(struct_subj)
 
-        for f_path in sorted(struct_subj.glob("*.json")):
+        for f_path in sorted(struct_files):
             data = json.loads(f_path.read_text(encoding="utf-8"))
             sec_id = data.get("section_id", "?")
             if chapter_num and not sec_id.startswith(f"{chapter_num}."):
@@ -371,7 +387,7 @@ def run_phase8_2(pdf_filename=None, chapter_num=None):
                 if not all_issues:
                     print(f"    ✅ Verified on attempt {attempt + 1}")
                     out_path = verified_subj / f_path.name
-                    out_path.write_text(json.dumps(current_data, indent=2, ensure_ascii=False), encoding="utf-8")
+                    _write_json_atomic(out_path, current_data)
                     break
                 else:
                     print(f"    ❌ Found {len(all_issues)} issues (attempt {attempt + 1}):")
@@ -389,7 +405,7 @@ def run_phase8_2(pdf_filename=None, chapter_num=None):
                         print(f"    ⚠️  Saving best-effort version for {sec_id} after {max_attempts} fix attempts.")
                         print(f"    Remaining issues: {len(all_issues)}")
                         out_path = verified_subj / f_path.name
-                        out_path.write_text(json.dumps(current_data, indent=2, ensure_ascii=False), encoding="utf-8")
+                        _write_json_atomic(out_path, current_data)
 
         # Clean up duplicates in verified output too
         _cleanup_duplicates(verified_subj)
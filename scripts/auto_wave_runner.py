@@ -1,8 +1,9 @@
 """
 Auto-Wave Runner — Monitors Wave 1 completion and chains Waves 2-4 automatically.
 
-Polls pipeline status every 60 seconds. When the current wave is done,
-launches the next wave. Reports progress along the way.
+Waits on the background Wave 1 process (via its PID file), then launches
+each remaining wave as a subprocess and awaits its exit — the completion
+matrix is only rebuilt at wave boundaries. Reports progress along the way.
 
 Usage:
     python scripts/auto_wave_runner.py
@@ -10,8 +11,7 @@ Usage:
 
 import sys
 import os
-import time
-import subprocess
+import asyncio
 from pathlib import Path
 from datetime import datetime
 
@@ -24,9 +24,15 @@ if sys.platform == "win32":
     sys.stdout.reconfigure(encoding="utf-8", errors="replace")
     sys.stderr.reconfigure(encoding="utf-8", errors="replace")
 
-from parallel_pipeline import get_completion_matrix, generate_work_items, BOOKS
+from parallel_pipeline import get_completion_matrix, generate_work_items, BOOKS, PID_FILE
 
-POLL_INTERVAL = 60  # seconds between status checks
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+POLL_INTERVAL = 60  # seconds between matrix checks (fallback when no PID is available)
+PID_POLL_INTERVAL = 5  # seconds between liveness checks of the Wave 1 process
 
 def count_wave_items(wave_items):
     """Count total and API-needed items in a wave."""
@@ -57,7 +63,35 @@ def print_progress(matrix):
                     row += f" {done:2d}/{total}"
         print(row)
 
-def run_wave(wave_num):
+def read_pipeline_pid():
+    """Return the PID of a running parallel_pipeline.py, or None if unknown."""
+    if psutil is None:
+        return None
+    try:
+        pid = int(PID_FILE.read_text(encoding="utf-8").strip())
+    except (OSError, ValueError):
+        return None
+    return pid if psutil.pid_exists(pid) else None
+
+async def wait_for_background_wave1():
+    """Block until the background Wave 1 run finishes, then return a fresh matrix."""
+    pid = read_pipeline_pid()
+    if pid is not None:
+        print(f"   Watching PID {pid} (from {PID_FILE.name})")
+        while psutil.pid_exists(pid):
+            await asyncio.sleep(PID_POLL_INTERVAL)
+        return get_completion_matrix()
+    
+    # No PID to watch — fall back to checking the output matrix
+    while True:
+        await asyncio.sleep(POLL_INTERVAL)
+        matrix = get_completion_matrix()
+        if wave_is_empty(matrix, "wave1"):
+            return matrix
+        remaining = len(generate_work_items(matrix).get("wave1", []))
+        print(f"  [{datetime.now().strftime('%H:%M:%S')}] Wave 1: {remaining} items remaining...")
+
+async def run_wave(wave_num):
     """Launch a pipeline wave and wait for it to complete."""
     print(f"\n{'='*60}")
     print(f"🚀 LAUNCHING WAVE {wave_num}")
@@ -67,15 +101,15 @@ def run_wave(wave_num):
     env = os.environ.copy()
     env["PYTHONUNBUFFERED"] = "1"
     
-    result = subprocess.run(
-        [sys.executable, str(REPO_ROOT / "scripts" / "parallel_pipeline.py"), "--wave", str(wave_num)],
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, str(REPO_ROOT / "scripts" / "parallel_pipeline.py"), "--wave", str(wave_num),
         env=env,
         cwd=str(REPO_ROOT),
     )
     
-    return result.returncode == 0
+    return await proc.wait() == 0
 
-def main():
+async def main():
     print(f"\n{'='*60}")
     print(f"🤖 MCAT MASTERY — AUTO-WAVE RUNNER")
     print(f"   Monitors waves and chains them automatically")
@@ -105,22 +139,13 @@ def main():
     # If Wave 1 is the first remaining, wait for it (it's running in background)
     if waves_to_run[0] == 1:
         print(f"\n⏳ Wave 1 is running in background. Monitoring completion...")
-        while True:
-            time.sleep(POLL_INTERVAL)
-            matrix = get_completion_matrix()
-            
-            if wave_is_empty(matrix, "wave1"):
-                print(f"\n✅ Wave 1 COMPLETE at {datetime.now().strftime('%H:%M:%S')}!")
-                print_progress(matrix)
-                waves_to_run.pop(0)
-                break
-            else:
-                remaining = len(generate_work_items(matrix).get("wave1", []))
-                print(f"  [{datetime.now().strftime('%H:%M:%S')}] Wave 1: {remaining} items remaining...")
+        matrix = await wait_for_background_wave1()
+        print(f"\n✅ Wave 1 finished at {datetime.now().strftime('%H:%M:%S')}!")
+        print_progress(matrix)
+        waves_to_run.pop(0)
     
-    # Run remaining waves sequentially
+    # Run remaining waves sequentially; the matrix is refreshed once per wave boundary
     for wave_num in waves_to_run:
-        matrix = get_completion_matrix()
         items = generate_work_items(matrix).get(f"wave{wave_num}", [])
         
         if not items:
@@ -130,17 +155,17 @@ def main():
         print(f"\n📊 Pre-Wave {wave_num} status:")
         print_progress(matrix)
         
-        success = run_wave(wave_num)
+        success = await run_wave(wave_num)
+        matrix = get_completion_matrix()
         
         if not success:
             print(f"\n⚠️ Wave {wave_num} exited with errors. Checking remaining items...")
-            matrix = get_completion_matrix()
             remaining = len(generate_work_items(matrix).get(f"wave{wave_num}", []))
             if remaining > 0:
                 print(f"   {remaining} items still incomplete. Retrying wave {wave_num}...")
-                run_wave(wave_num)
+                await run_wave(wave_num)
+                matrix = get_completion_matrix()
         
-        matrix = get_completion_matrix()
         print(f"\n📊 Post-Wave {wave_num} status:")
         print_progress(matrix)
     
@@ -150,8 +175,7 @@ def main():
     print(f"   Finished: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"{'='*60}")
     
-    matrix = get_completion_matrix()
     print_progress(matrix)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
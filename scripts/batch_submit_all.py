@@ -1,7 +1,7 @@
 import sys
 import json
 from pathlib import Path
-import time
+from concurrent.futures import ThreadPoolExecutor
 import traceback
 
 # Add project root to sys.path
@@ -17,8 +17,13 @@ from phases.phase2.phase2_extract_assessments import run as run_phase2
 from phases.phase3.phase3_extract_sections import run as run_phase3
 from phases.phase4.phase4_extract_glossary import run as run_phase4
 from phases.phase5.phase5_catalog_figures import run as run_phase5
+from utils.gemini_client import GeminiClient
 
-BOOKS = config.BOOKS
+BOOK_ITEMS = config.BOOK_ITEMS
+
+# GeminiClient's RPM/TPM limits are shared by every client in the process,
+# so overlapping submissions queue on them rather than multiplying the rate
+MAX_WORKERS = 10
 
 def check_exists(phase, subject, chapter=None):
     if phase == 1:
@@ -48,11 +53,30 @@ def get_chapters(subject):
         data = json.load(f)
         return [ch["chapter_number"] for ch in data.get("chapters", [])]
 
-def main():
-    print("🚀 Starting Batch Submission...")
+def run_phase_parallel(phase, runner, work):
+    """Run one phase over (pdf, subject, chapter) work items concurrently."""
+    if not work:
+        return
 
+    def _submit(args):
+        pdf, subject, ch = args
+        label = f"{subject} Ch {ch}" if ch is not None else subject
+        print(f"Running Phase {phase} for {label}...")
+        try:
+            if ch is None:
+                runner(pdf)
+            else:
+                runner(pdf, ch)
+        except Exception as e:
+            print(f"❌ Failed Phase {phase} for {label}: {e}")
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(work))) as executor:
+        list(executor.map(_submit, work))
+
+def submit_all():
+    """Submit phases 1-5 for every book, skipping outputs that already exist."""
     # Phase 1: TOC (Only CARS needs it according to user)
-    for pdf, subject in BOOKS.items():
+    for pdf, subject in BOOK_ITEMS:
         if not check_exists(1, subject):
             print(f"Running Phase 1 for {subject} ({pdf})...")
             try:
@@ -61,54 +85,35 @@ def main():
                 print(f"❌ Failed Phase 1 for {subject}: {e}")
 
     # Reload BOOKS and subjects to ensure we have TOCs
-    for pdf, subject in BOOKS.items():
+    book_chapters = []
+    for pdf, subject in BOOK_ITEMS:
         chapters = get_chapters(subject)
         if not chapters:
             print(f"⚠️ No chapters found for {subject}, skipping phases 2-5")
             continue
+        book_chapters.append((pdf, subject, chapters))
 
-        # Phase 2: Assessments
-        for ch in chapters:
-            if not check_exists(2, subject, ch):
-                print(f"Running Phase 2 for {subject} Ch {ch}...")
-                try:
-                    run_phase2(pdf, ch)
-                except Exception as e:
-                    print(f"❌ Failed Phase 2 for {subject} Ch {ch}: {e}")
-                # Rate limiting is now handled dynamically in GeminiClient
-                time.sleep(2)
-
-        # Phase 3: Sections
-        for ch in chapters:
-            if not check_exists(3, subject, ch):
-                print(f"Running Phase 3 for {subject} Ch {ch}...")
-                try:
-                    run_phase3(pdf, ch)
-                except Exception as e:
-                    print(f"❌ Failed Phase 3 for {subject} Ch {ch}: {e}")
-                # Rate limiting is now handled dynamically in GeminiClient
-                time.sleep(2)
-
-        # Phase 4: Glossary
-        if not check_exists(4, subject):
-            print(f"Running Phase 4 for {subject}...")
-            try:
-                run_phase4(pdf)
-            except Exception as e:
-                print(f"❌ Failed Phase 4 for {subject}: {e}")
-            # Rate limiting is now handled dynamically in GeminiClient
-            time.sleep(2)
-
-        # Phase 5: Figures
-        for ch in chapters:
-            if not check_exists(5, subject, ch):
-                print(f"Running Phase 5 for {subject} Ch {ch}...")
-                try:
-                    run_phase5(pdf, ch)
-                except Exception as e:
-                    print(f"❌ Failed Phase 5 for {subject} Ch {ch}: {e}")
-                # Rate limiting is now handled dynamically in GeminiClient
-                time.sleep(2)
+    # Phases 2-5: each phase is submitted across all books at once
+    for phase, runner in ((2, run_phase2), (3, run_phase3), (4, run_phase4), (5, run_phase5)):
+        if phase == 4:
+            work = [(pdf, subject, None) for pdf, subject, _ in book_chapters
+                    if not check_exists(4, subject)]
+        else:
+            work = [(pdf, subject, ch) for pdf, subject, chapters in book_chapters
+                    for ch in chapters if not check_exists(phase, subject, ch)]
+        run_phase_parallel(phase, runner, work)
+
+def main():
+    print("🚀 Starting Batch Submission...")
+
+    # Each phase run() ends with client.cleanup(); with chapters running in
+    # parallel that would delete PDFs other threads are still using, so the
+    # uploads are kept until the whole batch is done.
+    GeminiClient.keep_uploads = True
+    try:
+        submit_all()
+    finally:
+        GeminiClient.delete_uploads()
 
     print("✅ Batch Submission complete!")
 
@@ -1,43 +1,152 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-import os
-from dotenv import load_dotenv
+import time
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-# Load environment variables
-load_dotenv(Path(__file__).parent.parent / ".env")
-API_KEY = os.getenv("ELEVENLABS_API_KEY")
-
-def list_voices():
-    url = "https://api.elevenlabs.io/v1/voices"
-    headers = {
-        "xi-api-key": API_KEY
-    }
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        voices = response.json()["voices"]
-        for voice in voices:
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# config parses .env once (cached) and exposes the key
+from config import ELEVENLABS_API_KEY as API_KEY
+
+API_BASE = "https://api.elevenlabs.io/v1"
+# v2 voices endpoint supports a server-side `search` filter
+VOICES_SEARCH_URL = "https://api.elevenlabs.io/v2/voices"
+
+# Voice/model catalogs change rarely — reuse results for a day
+CACHE_DIR = Path.home() / ".cache" / "cursormcat"
+CACHE_TTL = 24 * 60 * 60  # seconds
+
+REQUEST_TIMEOUT = 30  # seconds
+
+# One keep-alive session for every call so the TCP/TLS connection is reused;
+# transient failures are retried instead of costing a full rerun
+SESSION = requests.Session()
+SESSION.headers["xi-api-key"] = API_KEY or ""
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    # raise_on_status=False: once retries run out, hand back the last response so
+    # the status_code checks below report it instead of a RetryError traceback
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                      raise_on_status=False),
+))
+
+_key_lock = threading.Lock()
+_key_ok = None
+
+def elevenlabs_key_ok():
+    """Check API_KEY once per process against a cheap endpoint, so we can bail
+    out before firing slow calls that would just 401. The lock makes concurrent
+    first callers share the one request."""
+    global _key_ok
+    with _key_lock:
+        if _key_ok is None:
+            if not API_KEY:
+                _key_ok = False
+            else:
+                try:
+                    with SESSION.get(f"{API_BASE}/user", timeout=5) as r:
+                        _key_ok = r.status_code != 401
+                except requests.RequestException:
+                    return True  # Network trouble isn't a bad key — let the real call report it
+        return _key_ok
+
+def disk_cache(ttl, path):
+    """Cache a function's JSON-serializable result in `path` for `ttl` seconds.
+    A None result (request failed) is never cached."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper():
+            try:
+                if path.stat().st_mtime > time.time() - ttl:
+                    return json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                pass
+            result = func()
+            if result is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps(result), encoding="utf-8")
+            return result
+        return wrapper
+    return decorator
+
+def iter_json_items(response, prefix):
+    """Return an iterator over the array items at `prefix` ("item" for a top-level list).
+    Parses incrementally when ijson is installed so callers can stop early."""
+    if ijson is not None:
+        response.raw.decode_content = True
+        return ijson.items(response.raw, prefix)
+    # orjson decodes the raw bytes directly, skipping response.json()'s str decode
+    data = orjson.loads(response.content) if orjson is not None else response.json()
+    for key in prefix.split(".")[:-1]:
+        data = data[key]
+    return iter(data)
+
+@disk_cache(ttl=CACHE_TTL, path=CACHE_DIR / "voices.json")
+def fetch_voices():
+    """Return the first voice named Jessica (as a one-item list), or None on error."""
+    if not elevenlabs_key_ok():
+        print("Error listing voices: ELEVENLABS_API_KEY is missing or invalid")
+        return None
+    # Let the API filter by name so only matching voices come over the wire
+    with SESSION.get(VOICES_SEARCH_URL, params={"search": "Jessica"},
+                     stream=ijson is not None, timeout=REQUEST_TIMEOUT) as response:
+        if response.status_code != 200:
+            print(f"Error listing voices: {response.text}")
+            return None
+        # Stop at the first match; the rest of the body is never parsed
+        for voice in iter_json_items(response, "voices.item"):
             if "Jessica" in voice["name"]:
-                print(f"Voice Name: {voice['name']}, ID: {voice['voice_id']}")
-    else:
-        print(f"Error listing voices: {response.text}")
-
-def list_models():
-    url = "https://api.elevenlabs.io/v1/models"
-    headers = {
-        "xi-api-key": API_KEY
-    }
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        models = response.json()
-        for model in models:
-            if "v3" in model["model_id"].lower() or "v3" in model["name"].lower():
-                print(f"Model ID: {model['model_id']}, Name: {model['name']}")
-    else:
-        print(f"Error listing models: {response.text}")
+                return [{"name": voice["name"], "voice_id": voice["voice_id"]}]
+    return []
+
+@disk_cache(ttl=CACHE_TTL, path=CACHE_DIR / "models.json")
+def fetch_models():
+    """Return all v3 models, or None on error."""
+    if not elevenlabs_key_ok():
+        print("Error listing models: ELEVENLABS_API_KEY is missing or invalid")
+        return None
+    url = f"{API_BASE}/models"
+    # No server-side filter for models; parse incrementally when ijson is installed
+    with SESSION.get(url, stream=ijson is not None, timeout=REQUEST_TIMEOUT) as response:
+        if response.status_code != 200:
+            print(f"Error listing models: {response.text}")
+            return None
+        models = iter_json_items(response, "item")
+        return [
+            {"model_id": model["model_id"], "name": model["name"]}
+            for model in models
+            if "v3" in model["model_id"].lower() or "v3" in model["name"].lower()
+        ]
+
+def list_voices(voices=None):
+    for voice in (fetch_voices() if voices is None else voices) or []:
+        print(f"Voice Name: {voice['name']}, ID: {voice['voice_id']}")
+
+def list_models(models=None):
+    for model in (fetch_models() if models is None else models) or []:
+        print(f"Model ID: {model['model_id']}, Name: {model['name']}")
 
 if __name__ == "__main__":
-    print("--- Voices ---")
-    list_voices()
-    print("\n--- Models ---")
-    list_models()
+    with SESSION:
+        # Both lookups are independent and network-bound — fetch them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            voices_future = executor.submit(fetch_voices)
+            models_future = executor.submit(fetch_models)
+        print("--- Voices ---")
+        list_voices(voices_future.result())
+        print("\n--- Models ---")
+        list_models(models_future.result())
@@ -3,8 +3,9 @@ Quick check: report whether configured per-phase output paths exist and list con
 Usage:
     python scripts/check_phase_outputs.py --subject biology
 """
+import os
 from pathlib import Path
-from config import ASSETS_DIR, EXTRACTED_DIR, PRIMITIVES_DIR, STRUCTURED_DIR, COMPILED_DIR, BRIDGES_DIR, AUDIO_DIR
+from config import ASSETS_DIR, EXTRACTED_DIR, PRIMITIVES_DIR, STRUCTURED_DIR, COMPILED_DIR, BRIDGES_DIR, AUDIO_DIR, PROJECT_ROOT
 import argparse
 
 parser = argparse.ArgumentParser()
@@ -21,18 +22,41 @@ paths = {
     "audio": AUDIO_DIR,
 }
 
+def existing_output_dirs():
+    """Collect phases/<phase>/output and its children with a few scandir calls
+    instead of one stat() per configured path."""
+    found = set()
+    try:
+        with os.scandir(PROJECT_ROOT / "phases") as phases:
+            phase_dirs = [e.path for e in phases if e.is_dir()]
+    except FileNotFoundError:
+        return found
+    for phase_dir in phase_dirs:
+        output_dir = os.path.join(phase_dir, "output")
+        try:
+            with os.scandir(output_dir) as it:
+                found.update(e.path for e in it)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        found.add(output_dir)
+    return found
+
+
+existing = existing_output_dirs()
 print("Per-phase output paths and existence:")
 for k, p in paths.items():
-    print(f"  {k}: {p} -> {'exists' if p.exists() else 'MISSING'}")
+    print(f"  {k}: {p} -> {'exists' if str(p) in existing else 'MISSING'}")
 
 if args.subject:
     print(f"\nContents for subject: {args.subject}")
     for k, p in paths.items():
         subj_path = p / args.subject
-        if subj_path.exists():
-            items = list(subj_path.iterdir())
-            print(f"  {k}: {len(items)} items in {subj_path}")
-        else:
+        # One opendir per directory; a missing dir surfaces as FileNotFoundError
+        try:
+            with os.scandir(subj_path) as it:
+                n = sum(1 for _ in it)
+            print(f"  {k}: {n} items in {subj_path}")
+        except FileNotFoundError:
             print(f"  {k}: {subj_path} (missing)")
 
 print("\nIf files are still in top-level folders (assets/, extracted/, etc.), run:")
@@ -7,30 +7,58 @@ All paths, API settings, and book definitions live here.
 
 import os
 import sys
+import threading
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 
-# Fix Windows terminal encoding for emoji/unicode output
+# Fix Windows terminal encoding for emoji/unicode output.
+# Skip streams that are already UTF-8 (PYTHONUTF8=1 / PYTHONIOENCODING) —
+# reconfigure() flushes and rebuilds the wrapper on every import.
 if sys.platform == "win32":
-    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
-    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+    for _stream in (sys.stdout, sys.stderr):
+        if (_stream.encoding or "").lower().replace("-", "") != "utf8":
+            _stream.reconfigure(encoding="utf-8", errors="replace")
 
 # Load .env from project root
 PROJECT_ROOT = Path(__file__).parent.parent
-load_dotenv(PROJECT_ROOT / ".env")
+
+
+@lru_cache(maxsize=None)
+def _load_env(path_str: str, mtime_ns: int) -> dict:
+    """Parse a .env file once per (path, mtime)."""
+    return {k: v for k, v in dotenv_values(path_str).items() if v is not None}
+
+
+def _read_dotenv(path: Path) -> dict:
+    try:
+        return _load_env(str(path), path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        return {}
+
+
+_ENV = _read_dotenv(PROJECT_ROOT / ".env")
+# Like load_dotenv(): real environment variables win, .env only fills the gaps
+for _k, _v in _ENV.items():
+    os.environ.setdefault(_k, _v)
+
+
+def env(name: str, default: str = "") -> str:
+    """Read a setting from the environment (.env values were merged in above)."""
+    return os.environ.get(name, default)
+
 
 # ─── API Keys ───────────────────────────────────────────────
 # Support both single key and numbered multi-key configs.
 # The parallel pipeline worker sets GEMINI_API_KEY in the env before this loads.
 # If not set, fall back to GEMINI_API_KEY_1 from .env as a reasonable default.
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "") or os.getenv("GEMINI_API_KEY_1", "")
-GOOGLE_CLOUD_PROJECT_ID = os.getenv("GOOGLE_CLOUD_PROJECT_ID", "")
+GEMINI_API_KEY = env("GEMINI_API_KEY") or env("GEMINI_API_KEY_1")
+GOOGLE_CLOUD_PROJECT_ID = env("GOOGLE_CLOUD_PROJECT_ID")
+ELEVENLABS_API_KEY = env("ELEVENLABS_API_KEY")
+
+# Load all 5 keys for parallel pipeline use (one pass, empties skipped)
+GEMINI_API_KEYS = [k for i in range(1, 6) if (k := env(f"GEMINI_API_KEY_{i}"))]
 
-# Load all 5 keys for parallel pipeline use
-GEMINI_API_KEYS = [
-    os.getenv(f"GEMINI_API_KEY_{i}", "") for i in range(1, 6)
-]
-GEMINI_API_KEYS = [k for k in GEMINI_API_KEYS if k]  # Filter empty
 
 # ─── Gemini Model Settings ──────────────────────────────────
 # Strategy: Try Gemini 3 Flash first (best quality). If it fails
@@ -57,26 +85,48 @@ PDFS_DIR = PROJECT_ROOT / "pdfs"
 
 # Per-phase outputs: each phase writes its outputs beneath its own folder
 # e.g., Phase 0 → phases/phase0/output/assets, Phase 1 → phases/phase1/output/extracted
-ASSETS_DIR = PROJECT_ROOT / "phases" / "phase0" / "output" / "assets"
-TOC_DIR = PROJECT_ROOT / "phases" / "phase1" / "output" / "extracted"
-EXTRACTED_DIR = TOC_DIR  # Legacy handle for Phase 1 TOC
-
-ASSESSMENTS_DIR = PROJECT_ROOT / "phases" / "phase2" / "output" / "extracted"
-SECTIONS_DIR = PROJECT_ROOT / "phases" / "phase3" / "output" / "extracted"
-GLOSSARY_DIR = PROJECT_ROOT / "phases" / "phase4" / "output" / "extracted"
-FIGURE_CATALOG_DIR = PROJECT_ROOT / "phases" / "phase5" / "output" / "extracted"
-ENRICHED_ASSESSMENTS_DIR = PROJECT_ROOT / "phases" / "phase6" / "output"
-VERIFIED_ASSESSMENTS_DIR = PROJECT_ROOT / "phases" / "phase6_1" / "output" / "verified"
-TEMP_VERIFICATION_DIR = PROJECT_ROOT / "phases" / "phase6_1" / "output" / "temp"
-
-CLASSIFIED_DIR = PROJECT_ROOT / "phases" / "phase7_legacy" / "output" / "classified"
-STRUCTURED_DIR = PROJECT_ROOT / "phases" / "phase8" / "output" / "structured"
-VERIFIED_STRUCTURED_DIR = PROJECT_ROOT / "phases" / "phase8_2" / "output" / "verified"
-COMPILED_DIR = PROJECT_ROOT / "phases" / "phase8_1" / "output" / "compiled"
-PRIMITIVES_DIR = PROJECT_ROOT / "phases" / "phase7" / "output" / "primitives"
+# (name, phase folder, subfolder under output/ — "" for output/ itself)
+_PHASE_DIRS = (
+    ("ASSETS_DIR",               "phase0",        "assets"),
+    ("TOC_DIR",                  "phase1",        "extracted"),
+    ("ASSESSMENTS_DIR",          "phase2",        "extracted"),
+    ("SECTIONS_DIR",             "phase3",        "extracted"),
+    ("GLOSSARY_DIR",             "phase4",        "extracted"),
+    ("FIGURE_CATALOG_DIR",       "phase5",        "extracted"),
+    ("ENRICHED_ASSESSMENTS_DIR", "phase6",        ""),
+    ("VERIFIED_ASSESSMENTS_DIR", "phase6_1",      "verified"),
+    ("TEMP_VERIFICATION_DIR",    "phase6_1",      "temp"),
+    ("CLASSIFIED_DIR",           "phase7_legacy", "classified"),
+    ("PRIMITIVES_DIR",           "phase7",        "primitives"),
+    ("STRUCTURED_DIR",           "phase8",        "structured"),
+    ("COMPILED_DIR",             "phase8_1",      "compiled"),
+    ("VERIFIED_STRUCTURED_DIR",  "phase8_2",      "verified"),
+    ("BRIDGES_DIR",              "phase9",        "bridges"),
+    ("AUDIO_DIR",                "phase10",       "audio"),
+)
+_PHASE_DIR_PARTS = {name: (phase, sub) for name, phase, sub in _PHASE_DIRS}
+_PHASE_DIR_ALIASES = {"EXTRACTED_DIR": "TOC_DIR"}  # Legacy handle for Phase 1 TOC
+
+
+def __getattr__(name):
+    """Build phase output paths on first access (PEP 562) and cache them as
+    module globals, so scripts that import one or two dirs don't pay for all."""
+    target = _PHASE_DIR_ALIASES.get(name, name)
+    parts = _PHASE_DIR_PARTS.get(target)
+    if parts is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    phase, sub = parts
+    # joinpath builds the Path in one pass instead of a chain of `/` intermediates
+    path = globals().get(target) or PROJECT_ROOT.joinpath("phases", phase, "output", sub)
+    globals()[target] = globals()[name] = path
+    return path
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_PHASE_DIR_PARTS) | set(_PHASE_DIR_ALIASES))
+
+
 LORE_DIR = PROJECT_ROOT / "lore"
-BRIDGES_DIR = PROJECT_ROOT / "phases" / "phase9" / "output" / "bridges"
-AUDIO_DIR = PROJECT_ROOT / "phases" / "phase10" / "output" / "audio"
 PROMPTS_DIR = Path(__file__).parent / "prompts"  # legacy prompts folder (phase-level prompts also exist)
 
 # Note: After running `scripts/migrate_outputs_to_phases.py` (dry-run first),
@@ -86,26 +136,32 @@ PROMPTS_DIR = Path(__file__).parent / "prompts"  # legacy prompts folder (phase-
 # ─── Book Definitions ───────────────────────────────────────
 # Map each PDF filename to its subject slug
 # Update filenames here to match your actual PDF names in pdfs/
-BOOKS = {
-    "MCAT Biology Review.pdf":                  "biology",
-    "MCAT Biochemistry Review.pdf":             "biochemistry",
-    "MCAT General Chemistry Review.pdf":        "gen_chem",
-    "MCAT Organic Chemistry Review.pdf":        "org_chem",
-    "MCAT Physics and Math Review.pdf":         "physics",
-    "MCAT Behavioral Sciences Review.pdf":      "psych_soc",
-    "MCAT Critical Analysis and Reasoning Skills Review.pdf": "cars",
-}
+# BOOK_ITEMS is the frozen (pdf, slug) source of truth — hashable and cheap to
+# iterate; BOOKS is the lookup view used by `BOOKS[pdf]` / `pdf in BOOKS` callers.
+BOOK_ITEMS = (
+    ("MCAT Biology Review.pdf",                  "biology"),
+    ("MCAT Biochemistry Review.pdf",             "biochemistry"),
+    ("MCAT General Chemistry Review.pdf",        "gen_chem"),
+    ("MCAT Organic Chemistry Review.pdf",        "org_chem"),
+    ("MCAT Physics and Math Review.pdf",         "physics"),
+    ("MCAT Behavioral Sciences Review.pdf",      "psych_soc"),
+    ("MCAT Critical Analysis and Reasoning Skills Review.pdf", "cars"),
+)
+BOOKS = dict(BOOK_ITEMS)
 
 # ─── Rate Limiting (Paid tier: 200 RPM per key, 1M TPM) ────
 # With 5 keys on separate projects (billing enabled), each key gets full quotas.
 # Per-key limits: 200 RPM, 1M TPM. Workers use 1 key each.
 GEMINI_REQUESTS_PER_MINUTE = 60   # Conservative: ~60 RPM per worker to avoid bursts
 GEMINI_DELAY_BETWEEN_REQUESTS = 60 / GEMINI_REQUESTS_PER_MINUTE  # ~1.0 seconds
+GEMINI_DELAY_NS = (60 * 1_000_000_000) // GEMINI_REQUESTS_PER_MINUTE  # same delay, for time.monotonic_ns()
 # Per-request timeout (seconds) for Gemini API calls. Increased for heavy extraction.
-GEMINI_API_TIMEOUT = int(os.getenv("GEMINI_API_TIMEOUT", "600"))
+GEMINI_API_TIMEOUT = int(env("GEMINI_API_TIMEOUT", "600"))
 
-# Shared interrupt state to allow graceful shutdown across modules
-INTERRUPT_REQUESTED = False
+# Shared interrupt state to allow graceful shutdown across modules.
+# An Event so waiting code can use INTERRUPT_REQUESTED.wait(timeout) instead of
+# time.sleep() and wake up as soon as Ctrl+C is pressed.
+INTERRUPT_REQUESTED = threading.Event()
 
 # ─── TTS Settings (Google Cloud Text-to-Speech) ────────────
 # Multi-voice TTS: voice assignments loaded from lore/audio/tts_voices.json at runtime.
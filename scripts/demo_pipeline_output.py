@@ -2,11 +2,19 @@ import json
 import time
 import sys
 import os
+import atexit
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
+# Windows consoles only understand ANSI escapes once colorama wraps stdout
+_ANSI_OK = sys.platform != "win32"
 try:
     from colorama import init, Fore, Style
-    # Initialize colorama for windows terminal
-    init(autoreset=True)
+    # Initialize colorama for windows terminal. ANSI is native elsewhere, so skip
+    # the AnsiToWin32 stream wrapper (it re-parses every write) off Windows.
+    if sys.platform == "win32":
+        init(autoreset=True)
+        _ANSI_OK = True
 except ImportError:
     # Minimal fallback if colorama is missing
     class MockColor:
@@ -14,22 +22,107 @@ except ImportError:
     Fore = MockColor()
     Style = MockColor()
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
 from config import STRUCTURED_DIR, COMPILED_DIR, VERIFIED_STRUCTURED_DIR
 
+@lru_cache(maxsize=32)
+def _load_json(path_str: str) -> dict:
+    """Parse a demo JSON file once per process (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(Path(path_str).read_bytes())
+    with open(path_str, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+if msgspec is not None:
+    class _SectionView(msgspec.Struct):
+        """Top-level section keys the demo reads; the decoder skips the rest
+        without building Python objects for them."""
+        mission_briefing: Any = None
+        levels: Any = None
+
+    _SECTION_DECODER = msgspec.json.Decoder(_SectionView)
+
+@lru_cache(maxsize=32)
+def _load_section(path_str: str) -> dict:
+    """Load only the fields demo_section() uses (msgspec when installed)."""
+    if msgspec is None:
+        return _load_json(path_str)
+    view = _SECTION_DECODER.decode(Path(path_str).read_bytes())
+    return {k: v for k, v in (("mission_briefing", view.mission_briefing),
+                              ("levels", view.levels)) if v is not None}
+
+@lru_cache(maxsize=16)
+def _section_index(dir_str: str, mtime_ns: int) -> dict:
+    """Map section_id -> path for every `{section_id}-*.json` in a directory.
+    Keyed on the directory mtime, so adding/removing files rebuilds it."""
+    index = {}
+    with os.scandir(dir_str) as it:
+        for e in it:
+            if e.name.endswith(".json") and "-" in e.name:
+                index.setdefault(e.name.split("-", 1)[0], e.path)
+    return index
+
+def _find_section(dir_, section_id):
+    """Return the path of `{section_id}-*.json` in dir_, or None.
+    One stat() per call; the directory is only scanned when it has changed."""
+    try:
+        mtime_ns = os.stat(dir_).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _section_index(str(dir_), mtime_ns).get(str(section_id))
+
+def iter_json_ids(dir_):
+    """Yield the section id prefix of every JSON file in dir_ (nothing if it is missing)."""
+    try:
+        it = os.scandir(dir_)
+    except FileNotFoundError:
+        return
+    with it:
+        for e in it:
+            if e.name.endswith(".json"):
+                yield e.name.split("-", 1)[0]
+
+def _payload_size(inst):
+    """Serialized payload size for display. Prefers a `payload_size` stashed by
+    the compiler, then orjson; stdlib json.dumps only as the last resort."""
+    if "payload_size" in inst:
+        return inst["payload_size"]
+    payload = inst.get("payload")
+    if orjson is not None:
+        return len(orjson.dumps(payload))
+    return len(json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
 def clear():
-    # Clear screen for better demo feel
-    if sys.platform == "win32":
-        os.system('cls')
+    # Clear screen for better demo feel: write the escape directly instead of
+    # spawning cls/clear (a full process launch per call)
+    if _ANSI_OK:
+        sys.stdout.write("\x1b[2J\x1b[H")
+        sys.stdout.flush()
     else:
-        os.system('clear')
+        os.system('cls')
+
+TYPE_CHUNK = 4  # characters written per flush in the typing effect
 
 def type_text(text, delay=0.01):
-    for char in text:
-        sys.stdout.write(char)
+    # No typing effect when piped/redirected — just emit the whole line
+    if not sys.stdout.isatty():
+        print(text)
+        return
+    for i in range(0, len(text), TYPE_CHUNK):
+        sys.stdout.write(text[i:i + TYPE_CHUNK])
         sys.stdout.flush()
-        time.sleep(delay)
+        time.sleep(delay * TYPE_CHUNK)
     print()
 
 def demo_section(subject, section_id):
@@ -38,91 +131,87 @@ def demo_section(subject, section_id):
     s_dir = STRUCTURED_DIR / subject
     
     source_label = ""
-    candidates = list(v_dir.glob(f"{section_id}-*.json"))
-    if candidates:
+    section_path = _find_section(v_dir, section_id)
+    if section_path:
         source_label = "PHASE 8.2 (VERIFIED)"
     else:
-        candidates = list(s_dir.glob(f"{section_id}-*.json"))
-        if candidates:
+        section_path = _find_section(s_dir, section_id)
+        if section_path:
             source_label = "PHASE 8 (RAW)"
 
-    if not candidates:
+    if not section_path:
         print(f"❌ No Phase 8 or 8.2 output found for {subject} {section_id}")
         return
     
-    with open(candidates[0], "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = _load_section(section_path)
 
-    print(f"\n{Fore.CYAN}{'='*60}")
-    print(f"{Fore.CYAN}DEMO: GUIDED LEARNING SESSION [{source_label}]")
-    print(f"{Fore.CYAN}{'='*60}\n")
+    rule = f"{Fore.CYAN}{'='*60}"
+    sys.stdout.write(f"\n{rule}\n{Fore.CYAN}DEMO: GUIDED LEARNING SESSION [{source_label}]\n{rule}{Style.RESET_ALL}\n\n")
     
     # Mission Briefing
     brief = data.get("mission_briefing", {})
-    print(f"{Fore.YELLOW}[MISSION BRIEFING]")
-    type_text(f"{Fore.WHITE}{brief.get('narrator_text', '')}")
-    print(f"\n{Fore.GREEN}ON-SCREEN DISPLAY:")
-    print(f"{Style.DIM}{brief.get('display_text', '')}")
-    input(f"\n{Fore.BLUE}Press Enter to start Level 1...")
+    print(f"{Fore.YELLOW}[MISSION BRIEFING]{Style.RESET_ALL}")
+    type_text(f"{Fore.WHITE}{brief.get('narrator_text', '')}{Style.RESET_ALL}")
+    print(f"\n{Fore.GREEN}ON-SCREEN DISPLAY:{Style.RESET_ALL}")
+    print(f"{Style.DIM}{brief.get('display_text', '')}{Style.RESET_ALL}")
+    input(f"\n{Fore.BLUE}Press Enter to start Level 1...{Style.RESET_ALL}")
 
     for level in data.get("levels", []):
         clear()
         lvl_num = level.get("level")
         lvl_title = level.get("title")
-        print(f"{Fore.MAGENTA}LEVEL {lvl_num}: {lvl_title}")
-        print(f"{Fore.MAGENTA}{'-'*30}")
+        print(f"{Fore.MAGENTA}LEVEL {lvl_num}: {lvl_title}{Style.RESET_ALL}")
+        print(f"{Fore.MAGENTA}{'-'*30}{Style.RESET_ALL}")
 
         # Learn Segments
         for seg in level.get("learn_segments", []):
-            print(f"\n{Fore.YELLOW}[COMPANION VOICE]")
-            type_text(f"{Fore.WHITE}{seg.get('narrator_text', '')}")
-            print(f"{Fore.GREEN}DISPLAY: {Style.BRIGHT}{seg.get('display_text', '')}")
+            print(f"\n{Fore.YELLOW}[COMPANION VOICE]{Style.RESET_ALL}")
+            type_text(f"{Fore.WHITE}{seg.get('narrator_text', '')}{Style.RESET_ALL}")
+            print(f"{Fore.GREEN}DISPLAY: {Style.BRIGHT}{seg.get('display_text', '')}{Style.RESET_ALL}")
             if seg.get("key_term"):
-                print(f"{Fore.RED}NEW TERM: {seg.get('key_term')}")
+                print(f"{Fore.RED}NEW TERM: {seg.get('key_term')}{Style.RESET_ALL}")
             time.sleep(0.5)
 
         # Check Questions
         for q in level.get("check_questions", []):
-            print(f"\n{Fore.BLUE}[CHECK QUESTION]")
-            print(f"{Fore.WHITE}{q.get('question_text')}")
+            print(f"\n{Fore.BLUE}[CHECK QUESTION]{Style.RESET_ALL}")
+            print(f"{Fore.WHITE}{q.get('question_text')}{Style.RESET_ALL}")
             options = q.get("options", [])
             for i, opt in enumerate(options):
                 print(f"  {i}) {opt}")
             
             choice = input(f"\nPick 0-{len(options)-1}: ")
             if str(choice) == str(q.get("correct_index")):
-                print(f"\n{Fore.GREEN}✨ {q.get('correct_response')}")
+                print(f"\n{Fore.GREEN}✨ {q.get('correct_response')}{Style.RESET_ALL}")
             else:
-                print(f"\n{Fore.YELLOW}💡 {q.get('wrong_response')}")
+                print(f"\n{Fore.YELLOW}💡 {q.get('wrong_response')}{Style.RESET_ALL}")
             input("Press Enter...")
 
         # Apply Question
         aq = level.get("apply_question")
         if aq:
             clear()
-            print(f"{Fore.MAGENTA}--- LEVEL {lvl_num} BOSS CHALLENGE ---")
-            print(f"{Fore.YELLOW}[SCENARIO]")
-            type_text(f"{Fore.WHITE}{aq.get('scenario', '')}")
-            print(f"\n{Fore.BLUE}[QUESTION]")
-            print(f"{Fore.WHITE}{aq.get('question_text')}")
+            print(f"{Fore.MAGENTA}--- LEVEL {lvl_num} BOSS CHALLENGE ---{Style.RESET_ALL}")
+            print(f"{Fore.YELLOW}[SCENARIO]{Style.RESET_ALL}")
+            type_text(f"{Fore.WHITE}{aq.get('scenario', '')}{Style.RESET_ALL}")
+            print(f"\n{Fore.BLUE}[QUESTION]{Style.RESET_ALL}")
+            print(f"{Fore.WHITE}{aq.get('question_text')}{Style.RESET_ALL}")
             options = aq.get("options", [])
             for i, opt in enumerate(options):
                 print(f"  {i}) {opt}")
             
             choice = input(f"\nPick 0-{len(options)-1}: ")
             if str(choice) == str(aq.get("correct_index")):
-                print(f"\n{Fore.GREEN}🏆 SUCCESS! {aq.get('correct_response')}")
+                print(f"\n{Fore.GREEN}🏆 SUCCESS! {aq.get('correct_response')}{Style.RESET_ALL}")
             else:
-                print(f"\n{Fore.RED}💥 FAILED. {aq.get('wrong_response')}")
+                print(f"\n{Fore.RED}💥 FAILED. {aq.get('wrong_response')}{Style.RESET_ALL}")
                 if aq.get("reasoning"):
-                    print(f"{Fore.WHITE}Logical Chain: {aq.get('reasoning')}")
+                    print(f"{Fore.WHITE}Logical Chain: {aq.get('reasoning')}{Style.RESET_ALL}")
             input("Press Enter to continue level...")
 
     clear()
-    print(f"\n{Fore.CYAN}{'='*60}")
-    print(f"{Fore.CYAN}GUIDED LEARNING COMPLETE!")
-    print(f"{Fore.CYAN}{'='*60}")
-    print(f"\nNew Game Modes Unlocked for Section {section_id}!")
+    sys.stdout.write(f"\n{rule}\n{Fore.CYAN}GUIDED LEARNING COMPLETE!\n{rule}\n"
+                     f"{Style.RESET_ALL}\nNew Game Modes Unlocked for Section {section_id}!\n")
     
     # 2. Load Phase 8.1 (Compiled Modes)
     compiled_path = COMPILED_DIR / subject / f"{section_id}_modes.json"
@@ -130,30 +219,34 @@ def demo_section(subject, section_id):
         print(f"⚠️ No Phase 8.1 modes found for {subject} {section_id}")
         return
 
-    with open(compiled_path, "r", encoding="utf-8") as f:
-        modes_data = json.load(f)
+    modes_data = _load_json(str(compiled_path))
 
-    print(f"\n{Fore.CYAN}ARCHETYPES DETECTED: {', '.join(modes_data.get('archetypes', []))}")
-    print(f"{Fore.CYAN}REGION: {modes_data.get('region', {}).get('name', 'Unknown')}")
+    print(f"\n{Fore.CYAN}ARCHETYPES DETECTED: {', '.join(modes_data.get('archetypes', []))}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}REGION: {modes_data.get('region', {}).get('name', 'Unknown')}{Style.RESET_ALL}")
     
-    print(f"\n{Fore.YELLOW}--- UNLOCKED MODES (GAMES) ---")
+    # Build the whole mode list and emit it in one write
+    lines = [f"\n{Fore.YELLOW}--- UNLOCKED MODES (GAMES) ---{Style.RESET_ALL}"]
     for inst in modes_data.get("mode_instances", []):
         m_type = inst.get("mode_type")
         diff = inst.get("difficulty")
         title = inst.get("payload", {}).get("title", "Game")
-        print(f"  🎮 {Fore.WHITE}{title} {Fore.GREEN}({m_type}) {Fore.BLUE}[{diff}]")
-        print(f"     {Style.DIM}Payload Size: {len(json.dumps(inst.get('payload')))} bytes")
+        lines.append(f"  🎮 {Fore.WHITE}{title} {Fore.GREEN}({m_type}) {Fore.BLUE}[{diff}]{Style.RESET_ALL}")
+        lines.append(f"     {Style.DIM}Payload Size: {_payload_size(inst)} bytes{Style.RESET_ALL}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
-    print(f"\n{Fore.WHITE}Demo finished. All outputs are valid and ready for the engine.")
+    print(f"\n{Fore.WHITE}Demo finished. All outputs are valid and ready for the engine.{Style.RESET_ALL}")
 
 if __name__ == "__main__":
     from config import BOOKS
     
+    # Never leave the shell colored, even on Ctrl+C mid-prompt
+    atexit.register(lambda: sys.stdout.write(Style.RESET_ALL))
+    
     if len(sys.argv) < 2:
-        print(f"\n{Fore.YELLOW}Usage: python scripts/demo_pipeline_output.py <subject_slug> <section_id>")
+        print(f"\n{Fore.YELLOW}Usage: python scripts/demo_pipeline_output.py <subject_slug> <section_id>{Style.RESET_ALL}")
         print(f"Example: python scripts/demo_pipeline_output.py gen_chem 1.1\n")
         
-        print(f"{Fore.CYAN}Available Subject Slugs:")
+        print(f"{Fore.CYAN}Available Subject Slugs:{Style.RESET_ALL}")
         for pdf, slug in BOOKS.items():
             print(f"  - {slug} ({pdf})")
         sys.exit(0)
@@ -161,19 +254,16 @@ if __name__ == "__main__":
     subject = sys.argv[1]
     
     if len(sys.argv) < 3:
-        print(f"\n{Fore.YELLOW}Listing available sections for {subject}...")
+        print(f"\n{Fore.YELLOW}Listing available sections for {subject}...{Style.RESET_ALL}")
         v_dir = VERIFIED_STRUCTURED_DIR / subject
         s_dir = STRUCTURED_DIR / subject
         
-        all_sections = set()
-        if v_dir.exists():
-            for f in v_dir.glob("*.json"):
-                all_sections.add(f.name.split("-")[0] + " (Verified)")
-        if s_dir.exists():
-            for f in s_dir.glob("*.json"):
-                sec_id = f.name.split("-")[0]
-                if not any(sec_id in x for x in all_sections):
-                    all_sections.add(sec_id + " (Raw)")
+        verified_ids = set(iter_json_ids(v_dir))
+        raw_ids = set(iter_json_ids(s_dir))
+        
+        # Hash-set difference instead of a substring scan per structured file
+        all_sections = {sec_id + " (Verified)" for sec_id in verified_ids}
+        all_sections.update(sec_id + " (Raw)" for sec_id in raw_ids - verified_ids)
         
         if not all_sections:
             print(f"❌ No sections found for {subject}")
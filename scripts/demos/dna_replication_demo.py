@@ -41,12 +41,18 @@ class DNAReplication(Scene):
         top_strand.shift(UP * y_gap)
         bot_strand.shift(DOWN * y_gap)
 
-        # Base pair rungs
+        fork_x = 0.5  # where the fork will be
+
+        # Base pair rungs (those past the fork are collected up front so the
+        # unwind step can fade them without querying positions)
         rungs = VGroup()
+        rungs_past_fork = VGroup()
         for x in range(-4, 5):
             rung = Line(UP * y_gap, DOWN * y_gap, color=BASE_PAIR,
                         stroke_width=2).shift(RIGHT * x * 0.9)
             rungs.add(rung)
+            if x * 0.9 > fork_x - 0.5:
+                rungs_past_fork.add(rung)
 
         dna = VGroup(top_strand, bot_strand, rungs).shift(DOWN * 0.5)
 
@@ -55,7 +61,7 @@ class DNAReplication(Scene):
 
         self.play(
             Create(top_strand), Create(bot_strand),
-            LaggedStart(*[FadeIn(r) for r in rungs], lag_ratio=0.05),
+            FadeIn(rungs, lag_ratio=0.05),
             FadeIn(dna_label, shift=UP * 0.2),
             run_time=1.5
         )
@@ -80,7 +86,6 @@ class DNAReplication(Scene):
         )
 
         # Animate helicase moving right and "splitting" the strands
-        fork_x = 0.5  # where the fork will be
         split_top = top_strand.copy().set_color(HELIX_A)
         split_bot = bot_strand.copy().set_color(HELIX_B)
 
@@ -92,7 +97,7 @@ class DNAReplication(Scene):
             bot_strand.animate.put_start_and_end_on(LEFT * 5 + DOWN * y_gap,
                                                      RIGHT * fork_x + DOWN * y_gap),
             # Fade out rungs past the fork
-            *[FadeOut(r) for r in rungs if r.get_center()[0] > fork_x - 0.5],
+            FadeOut(rungs_past_fork),
             run_time=1.5
         )
 
@@ -206,14 +211,15 @@ class DNAReplication(Scene):
 
         pol_lag = Circle(radius=0.22, color=POLYMERASE,
                          fill_opacity=0.85, stroke_width=2)
-        pol_lag_l = Text("Pol III", font_size=9, color=WHITE)
+        # Same glyphs as the leading polymerase label: copy instead of re-rendering
+        pol_lag_l = pol_label.copy().scale(9 / 10)
         pol_lag_l.move_to(pol_lag)
         pol_lag_grp = VGroup(pol_lag, pol_lag_l)
         pol_lag_grp.move_to(primers[0].get_center())
 
         self.play(FadeIn(pol_lag_grp, scale=0.5), run_time=0.3)
         self.play(
-            LaggedStart(*[Create(f) for f in fragments], lag_ratio=0.3),
+            Create(fragments, lag_ratio=0.3),
             run_time=1.5
         )
 
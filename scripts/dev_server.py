@@ -10,9 +10,12 @@ Open: http://localhost:8080/frontend/
 """
 
 import http.server
-import socketserver
+import gzip
+import io
+import mimetypes
 import sys
 import os
+import threading
 from pathlib import Path
 
 PORT = int(sys.argv[1]) if len(sys.argv) > 1 else 8080
@@ -20,31 +23,87 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 
 os.chdir(REPO_ROOT)
 
+# Register once in the global mimetypes table that guess_type() falls back to
+for _ext, _ctype in (
+    ('.json', 'application/json'),
+    ('.js', 'application/javascript'),
+    ('.mjs', 'application/javascript'),
+    ('.woff2', 'font/woff2'),
+    ('.webp', 'image/webp'),
+    ('.webmanifest', 'application/manifest+json'),
+):
+    mimetypes.add_type(_ctype, _ext)
+
 class CORSHandler(http.server.SimpleHTTPRequestHandler):
     """Allow CORS and serve JSON with correct MIME type."""
     
-    extensions_map = {
-        **http.server.SimpleHTTPRequestHandler.extensions_map,
-        '.json': 'application/json',
-        '.js':   'application/javascript',
-        '.mjs':  'application/javascript',
-        '.woff2': 'font/woff2',
-        '.webp': 'image/webp',
-        '.webmanifest': 'application/manifest+json',
-    }
+    # Keep-alive: the browser reuses connections for its many asset fetches
+    protocol_version = "HTTP/1.1"
+    
+    # Text-like types worth gzipping (lore/ JSON compresses ~8x)
+    GZIP_TYPES = ('text/', 'application/json', 'application/javascript',
+                  'application/manifest+json', 'image/svg+xml')
+    
+    # path -> (mtime_ns, gzipped body); shared by all handler threads
+    _gz_cache = {}
+    _gz_lock = threading.Lock()
+    
+    def send_head(self):
+        """Answer revalidations with 304 and serve cached gzip bodies when accepted."""
+        self._etag = None
+        path = self.translate_path(self.path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        if st is not None and not os.path.isdir(path):
+            # Weak validator: any edit bumps mtime/size, so reloads refetch only changed files
+            self._etag = f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+            if self._etag in self.headers.get('If-None-Match', ''):
+                self.send_response(304)
+                self.end_headers()
+                return None
+        if st is not None and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            ctype = self.guess_type(path)
+            if ctype.startswith(self.GZIP_TYPES) and self._etag:
+                body = self._gzipped(path)
+                self.send_response(200)
+                self.send_header('Content-Type', ctype)
+                self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Vary', 'Accept-Encoding')
+                self.end_headers()
+                return io.BytesIO(body)
+        return super().send_head()
+    
+    def _gzipped(self, path):
+        """Compress a file once per modification and reuse the bytes."""
+        mtime_ns = os.stat(path).st_mtime_ns
+        cached = self._gz_cache.get(path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        with open(path, 'rb') as f:
+            body = gzip.compress(f.read(), compresslevel=6)
+        with self._gz_lock:
+            self._gz_cache[path] = (mtime_ns, body)
+        return body
     
     def end_headers(self):
         self.send_header('Access-Control-Allow-Origin', '*')
+        if getattr(self, '_etag', None):
+            self.send_header('ETag', self._etag)
+        # no-cache = "revalidate first"; with the ETag that is a body-less 304
         self.send_header('Cache-Control', 'no-cache')
         super().end_headers()
     
     def log_message(self, format, *args):
         # Compact logging
-        if args and '200' in str(args):
-            return  # Skip 200s for cleaner output
+        if args and ('200' in str(args) or '304' in str(args)):
+            return  # Skip 200s/304s for cleaner output
         super().log_message(format, *args)
 
-with socketserver.TCPServer(("", PORT), CORSHandler) as httpd:
+# One thread per connection so a slow/keep-alive request doesn't block the rest
+with http.server.ThreadingHTTPServer(("", PORT), CORSHandler) as httpd:
     print(f"\n🌐 MCAT Mastery Dev Server")
     print(f"   Serving: {REPO_ROOT}")
     print(f"   Open:    http://localhost:{PORT}/frontend/")
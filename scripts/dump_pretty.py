@@ -0,0 +1,21 @@
+"""
+Pretty-print a compact JSON output file (structured sections, verifications).
+
+Usage:
+    python scripts/dump_pretty.py path/to/1.2_cell-theory.json
+    python scripts/dump_pretty.py a.json b.json | less
+"""
+import json
+import sys
+
+if len(sys.argv) < 2:
+    print("Usage: python scripts/dump_pretty.py <file.json> [more.json ...]")
+    sys.exit(1)
+
+for path in sys.argv[1:]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if len(sys.argv) > 2:
+        print(f"# {path}")
+    json.dump(data, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
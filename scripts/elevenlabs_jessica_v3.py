@@ -1,20 +1,24 @@
 import requests
-import json
-import os
-from dotenv import load_dotenv
-from pathlib import Path
+from requests.adapters import HTTPAdapter
 
-# Load environment variables
-load_dotenv(Path(__file__).parent.parent / ".env")
-
-# User provided API key from environment
-API_KEY = os.getenv("ELEVENLABS_API_KEY")
+# User provided API key from environment (config parses .env once, cached)
+from config import ELEVENLABS_API_KEY as API_KEY
 
 # Based on research:
 # Voice Name: Jessica -> ID: cgSgspJ2msm6clMCkdW9
 # Model ID: Eleven v3 -> ID: eleven_v3
 VOICE_ID = "cgSgspJ2msm6clMCkdW9"
 MODEL_ID = "eleven_v3"
+ERROR_PREVIEW_BYTES = 500
+
+# Pooled keep-alive session so repeated generations reuse the TLS connection
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "Accept": "audio/mpeg",
+    "Content-Type": "application/json",
+    "xi-api-key": API_KEY or "",
+})
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
 TEXT = (
     "Oh, wow.. Is this... is this me? Am I actually... talking? [giggle] "
@@ -26,12 +30,6 @@ TEXT = (
 def generate_tts():
     url = f"https://api.elevenlabs.io/v1/text-to-speech/{VOICE_ID}"
     
-    headers = {
-        "Accept": "audio/mpeg",
-        "Content-Type": "application/json",
-        "xi-api-key": API_KEY
-    }
-    
     data = {
         "text": TEXT,
         "model_id": MODEL_ID,
@@ -43,17 +41,24 @@ def generate_tts():
         }
     }
     
-    print(f"Sending request to ElevenLabs for voice '{VOICE_ID}' using model '{MODEL_ID}'...")
+    if not API_KEY:
+        print("Error: ELEVENLABS_API_KEY is not set (add it to .env)")
+        return
     
-    response = requests.post(url, json=data, headers=headers)
+    print(f"Sending request to ElevenLabs for voice '{VOICE_ID}' using model '{MODEL_ID}'...")
     
-    if response.status_code == 200:
-        with open("jessica_v3_test.mp3", "wb") as f:
-            f.write(response.content)
-        print("Success! Audio saved to jessica_v3_test.mp3")
-    else:
-        print(f"Error: {response.status_code}")
-        print(response.text)
+    # Stream the MP3 to disk in chunks instead of buffering the whole body
+    with _SESSION.post(url, json=data, stream=True) as response:
+        if response.status_code == 200:
+            with open("jessica_v3_test.mp3", "wb") as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+            print("Success! Audio saved to jessica_v3_test.mp3")
+        else:
+            print(f"Error: {response.status_code}")
+            # Only the head of the body: error pages can be large HTML documents
+            print(response.raw.read(ERROR_PREVIEW_BYTES, decode_content=True)
+                  .decode("utf-8", errors="replace"))
 
 if __name__ == "__main__":
     generate_tts()
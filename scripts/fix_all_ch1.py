@@ -3,16 +3,24 @@ Batch fix+verify for all Chapter 1 sections.
 Runs autonomously — each section gets up to 3 fix iterations.
 Prints a final summary at the end.
 
+Per-section fix iterations are kept in fix_all_ch1_stats.json (next to the usage
+log) and the sections that needed the most rounds last time are started first,
+so the slow ones don't end up running alone at the tail of the batch.
+
 Usage:
     python scripts/fix_all_ch1.py
 """
 import sys
+import asyncio
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from fix_and_verify import fix_section
+from fix_and_verify import fix_sections, background_logging, log, _read_json, _write_json_atomic
 from utils.gemini_client import GeminiClient
-from config import STRUCTURED_DIR
+from config import STRUCTURED_DIR, PROJECT_ROOT
+
+STATS_FILE = PROJECT_ROOT / "phases" / "phase6_1" / "output" / "usage" / "fix_all_ch1_stats.json"
+
 
 def main():
     client = GeminiClient()
@@ -20,29 +28,33 @@ def main():
     sections = ["1.1", "1.2", "1.3", "1.4", "1.5"]
     max_iter = 3
 
-    print("=" * 70)
-    print("BATCH FIX+VERIFY: Biology Chapter 1")
-    print(f"Sections: {', '.join(sections)}")
-    print(f"Max iterations per section: {max_iter}")
-    print("=" * 70)
-
-    results = {}
-    for sec_id in sections:
-        print(f"\n{'─'*50}")
-        print(f"Processing {sec_id}...")
-        print(f"{'─'*50}")
-        passed = fix_section(subject, sec_id, client, max_iter)
-        results[sec_id] = passed
-
-    print(f"\n{'='*70}")
-    print(f"FINAL RESULTS")
-    print(f"{'='*70}")
-    for sec_id, passed in results.items():
-        status = "PASSED" if passed else "NEEDS REVIEW"
-        print(f"  {sec_id}: {status}")
-
-    passed_count = sum(1 for v in results.values() if v)
-    print(f"\n  {passed_count}/{len(results)} sections passed")
+    # Longest-first: unknown sections are assumed to need every iteration
+    stats = _read_json(STATS_FILE) if STATS_FILE.exists() else {}
+    sections.sort(key=lambda s: -stats.get(s, {"iterations": max_iter})["iterations"])
+
+    with background_logging():
+        log.info("=" * 70)
+        log.info("BATCH FIX+VERIFY: Biology Chapter 1")
+        log.info(f"Sections: {', '.join(sections)}")
+        log.info(f"Max iterations per section: {max_iter}")
+        log.info("=" * 70)
+
+        # Sections are independent: fix them concurrently (bounded in fix_sections)
+        run_stats = {}
+        results = asyncio.run(fix_sections(subject, sections, client, max_iter, stats=run_stats))
+        stats.update(run_stats)
+        STATS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(STATS_FILE, stats)
+
+        log.info(f"\n{'='*70}")
+        log.info(f"FINAL RESULTS")
+        log.info(f"{'='*70}")
+        for sec_id, passed in results.items():
+            status = "PASSED" if passed else "NEEDS REVIEW"
+            log.info(f"  {sec_id}: {status}")
+
+        passed_count = sum(1 for v in results.values() if v)
+        log.info(f"\n  {passed_count}/{len(results)} sections passed")
 
     client.print_cost_summary()
     client.save_usage_log("usage_fix_all_ch1.json")
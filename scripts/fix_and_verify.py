@@ -10,59 +10,322 @@ Usage:
 """
 
 import sys
+import os
+import re
 import json
+import hashlib
+import string
+import asyncio
+import logging
+import queue
+from contextlib import contextmanager
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from slugify import slugify
 
 sys.path.insert(0, str(Path(__file__).parent))
-from config import EXTRACTED_DIR, STRUCTURED_DIR, PROMPTS_DIR
+from config import (EXTRACTED_DIR, STRUCTURED_DIR, PROMPTS_DIR,
+                    GEMINI_MODEL_PRIMARY, GEMINI_MODEL_FALLBACK, GEMINI_TEMPERATURE_ENRICH)
 from utils.gemini_client import GeminiClient
 from utils.schema_validator import validate_restructured, print_validation
 
-
-def load_original_data(subject: str, section_id: str) -> tuple[dict, list]:
-    """Load original extracted content for a section."""
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Sections fixed concurrently; each one is a chain of blocking Gemini round-trips
+MAX_CONCURRENT_SECTIONS = 5
+# Sections packed into one initial verification request (shared instructions sent once)
+VERIFY_BATCH_SIZE = 4
+
+# Prompt templates, read once per process
+FIX_TEMPLATE = (PROMPTS_DIR / "fix_content.txt").read_text(encoding="utf-8")
+VERIFY_TEMPLATE = (PROMPTS_DIR / "verify_accuracy.txt").read_text(encoding="utf-8")
+VERIFY_BATCH_TEMPLATE = (PROMPTS_DIR / "verify_accuracy_batch.txt").read_text(encoding="utf-8")
+# Stamped into verification files so results from older prompts can be told apart
+PROMPT_VERSION = hashlib.blake2b(
+    "\0".join((FIX_TEMPLATE, VERIFY_TEMPLATE, VERIFY_BATCH_TEMPLATE)).encode("utf-8"),
+    digest_size=6).hexdigest()
+
+# Verification results keyed by (prompt version, structured content, original text),
+# shared across runs so unchanged sections are never re-sent to the verifier
+VERIFY_CACHE_DIR = Path.home() / ".cache" / "mcat_verify"
+
+# Prompt budgets in tokens, estimated at ~4 chars/token like the rest of the pipeline
+CHARS_PER_TOKEN = 4
+FIX_ORIGINAL_TOKENS = 1500
+FIX_STRUCTURED_TOKENS = 3000
+VERIFY_TEXT_TOKENS = 2000
+
+# Progress output; plain stdout unless a run is inside background_logging()
+log = logging.getLogger("fix_and_verify")
+log.setLevel(logging.INFO)
+log.propagate = False
+if not log.handlers:
+    _stdout_handler = logging.StreamHandler(sys.stdout)
+    _stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_stdout_handler)
+
+# section_id normally sits in the first few lines of a structured file
+_SECTION_ID_RE = re.compile(rb'"section_id"\s*:\s*"([^"]+)"')
+_SECTION_ID_HEAD_BYTES = 2048
+
+
+@contextmanager
+def background_logging():
+    """
+    Hand `log` output to a QueueListener thread for the duration of the block, so
+    concurrent fix workers only enqueue records instead of contending for stdout.
+    Pending records are flushed when the block exits.
+    """
+    handlers = log.handlers[:]
+    q = queue.SimpleQueue()
+    listener = QueueListener(q, *handlers)
+    log.handlers = [QueueHandler(q)]
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+        log.handlers = handlers
+
+
+def _load_chapter(subject: str, chapter_num: int) -> dict:
+    """Parse a chapter's extracted JSON once per process."""
     extracted_dir = EXTRACTED_DIR / subject
-    chapter_num = int(section_id.split(".")[0])
-
     ch_files = sorted(extracted_dir.glob(f"ch{chapter_num:02d}_*.json"))
     ch_files = [f for f in ch_files if "_assessment" not in f.name]
     if not ch_files:
-        return {}, []
+        return {}
+    return _read_json(ch_files[0])
 
-    ch_data = json.loads(ch_files[0].read_text(encoding="utf-8"))
 
-    section = None
+@lru_cache(maxsize=None)
+def _chapter_index(subject: str, chapter_num: int) -> dict[str, tuple[dict, list]]:
+    """Map section_id -> (section, summary_points) for one chapter.
+    First match wins for both, as in the original linear scans."""
+    ch_data = _load_chapter(subject, chapter_num)
+    sections = {}
     for sec in ch_data.get("sections", []):
-        if sec.get("section_id") == section_id:
-            section = sec
-            break
-
-    summary = []
+        sections.setdefault(sec.get("section_id"), sec)
+    summaries = {}
     for s in ch_data.get("summary", {}).get("by_section", []):
-        if s["section_id"] == section_id:
-            summary = s.get("summary_points", [])
-            break
+        summaries.setdefault(s["section_id"], s.get("summary_points", []))
+    return {sid: (sections.get(sid) or {}, summaries.get(sid, []))
+            for sid in sections.keys() | summaries.keys()}
+
 
-    return section or {}, summary
+def load_original_data(subject: str, section_id: str) -> tuple[dict, list]:
+    """Load original extracted content for a section."""
+    chapter_num = int(section_id.split(".")[0])
+    return _chapter_index(subject, chapter_num).get(section_id, ({}, []))
 
 
 def build_original_text(section: dict, summary: list) -> str:
     """Convert original section data to readable text for the fix prompt."""
     parts = []
     parts.append(f"Learning Objectives: {json.dumps(section.get('learning_objectives', []))}")
-    for block in section.get("content_blocks", []):
+    seen = {}  # content hash -> block number of its first occurrence
+    for n, block in enumerate(section.get("content_blocks", []), 1):
         fmt = block.get("format", "text")
         content = block.get("content", "")
-        if isinstance(content, str):
-            parts.append(f"[{fmt}] {content}")
-        elif isinstance(content, list):
-            parts.append(f"[{fmt}] {json.dumps(content)}")
+        if isinstance(content, list):
+            content = json.dumps(content)
+        elif not isinstance(content, str):
+            continue
+        # Extractions sometimes repeat a block (e.g. a callout echoed in a table)
+        h = hashlib.blake2b(content.encode("utf-8"), digest_size=8).digest()
+        if h in seen:
+            parts.append(f"[{fmt}] <same as block #{seen[h]}>")
+            continue
+        seen[h] = n
+        parts.append(f"[{fmt}] {content}")
     if summary:
         parts.append(f"Summary: {json.dumps(summary)}")
     return "\n\n".join(parts)
 
 
+@lru_cache(maxsize=None)
+def load_original_text(subject: str, section_id: str) -> str:
+    """build_original_text for a section, rendered once per process."""
+    return build_original_text(*load_original_data(subject, section_id))
+
+
+@lru_cache(maxsize=16)
+def compile_template(template: str):
+    """
+    Parse a str.format prompt template once. The returned render(**fields) only
+    joins the pre-split pieces, so per-call cost no longer includes re-scanning
+    a multi-KB template for placeholders. Output is identical to template.format().
+    """
+    pieces = []  # (is_field, text)
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if literal:
+            pieces.append((False, literal))
+        if field is not None:
+            if spec or conversion or not field.isidentifier():
+                raise ValueError(f"Unsupported placeholder in prompt template: {{{field}}}")
+            pieces.append((True, field))
+
+    def render(**fields) -> str:
+        return "".join(str(fields[text]) if is_field else text for is_field, text in pieces)
+
+    return render
+
+
+def _read_json(path: Path):
+    """Parse a JSON file (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _dumps(obj, indent: bool = False) -> str:
+    """Serialize for prompts (orjson when installed). Non-ASCII is kept as-is."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
+
+
+def content_hash(obj) -> bytes:
+    """Stable digest of a JSON-able object (key order does not matter)."""
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _save_verification(path: Path, verification) -> None:
+    """Write a verification result stamped with the prompt version that produced it."""
+    if isinstance(verification, dict):
+        verification["prompt_version"] = PROMPT_VERSION
+    _write_json_atomic(path, verification)
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    """Write compact JSON via a temp file + os.replace so a reader never sees a partial file.
+    Use scripts/dump_pretty.py to read these files by hand."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    if orjson is not None:
+        tmp.write_bytes(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def verify_cache_key(structured, original_content: str, section_id: str, section_title: str) -> str:
+    """Content address of a verification: the prompt's inputs plus the verifier
+    model settings client.enrich() uses, so a model switch re-verifies."""
+    h = hashlib.blake2b(PROMPT_VERSION.encode("utf-8"), digest_size=16)
+    for part in (GEMINI_MODEL_PRIMARY, GEMINI_MODEL_FALLBACK, GEMINI_TEMPERATURE_ENRICH):
+        h.update(b"\0" + str(part).encode("utf-8"))
+    h.update(content_hash(structured))
+    for part in (original_content, section_id, section_title):
+        h.update(b"\0" + str(part).encode("utf-8"))
+    return h.hexdigest()
+
+
+def cached_verification(key: str):
+    """Verification stored under `key` by an earlier run, or None."""
+    path = VERIFY_CACHE_DIR / f"{key}.json"
+    try:
+        return _read_json(path)
+    except (OSError, ValueError):
+        return None
+
+
+def store_verification(key: str, verification) -> None:
+    """Cache a verification under `key` (error/non-dict responses are not kept)."""
+    if isinstance(verification, dict):
+        VERIFY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(VERIFY_CACHE_DIR / f"{key}.json", verification)
+
+
+def verify_cached(structured, original_content: str, section_id: str, section_title: str,
+                  client: GeminiClient):
+    """run_verification with VERIFY_TEMPLATE, skipping the API when this exact
+    content was verified before."""
+    key = verify_cache_key(structured, original_content, section_id, section_title)
+    verification = cached_verification(key)
+    if verification is not None:
+        log.info(f"     ♻️  Unchanged since last verification — reusing cached result")
+        return verification
+    verification = run_verification(structured, original_content, section_id, section_title,
+                                    VERIFY_TEMPLATE, client)
+    store_verification(key, verification)
+    return verification
+
+
+def quick_section_id(path: Path) -> str | None:
+    """Read a structured file's top-level section_id without parsing the whole file.
+    Tries the first 2KB, then streams with ijson (or a full parse without it)."""
+    with open(path, "rb") as f:
+        m = _SECTION_ID_RE.search(f.read(_SECTION_ID_HEAD_BYTES))
+        if m:
+            try:
+                return json.loads(b'"' + m.group(1) + b'"')
+            except ValueError:
+                pass
+        f.seek(0)
+        if ijson is not None:
+            # Only top-level keys: nested objects may carry their own section_id
+            for prefix, event, value in ijson.parse(f):
+                if prefix == "section_id" and event == "string":
+                    return value
+            return None
+        data = json.load(f)
+    return data.get("section_id") if isinstance(data, dict) else None
+
+
+def build_struct_index(subject: str) -> dict[str, Path]:
+    """Map section_id -> structured JSON path for a subject (one pass over the dir).
+    The first file per section_id wins, in file-name order."""
+    index = {}
+    for f in sorted((STRUCTURED_DIR / subject).glob("*.json")):
+        sec_id = quick_section_id(f)
+        if sec_id:
+            index.setdefault(sec_id, f)
+    return index
+
+
+def dedupe_issues(issues: list[dict]) -> list[dict]:
+    """Drop issues the verifier reported more than once for the same text."""
+    seen = set()
+    unique = []
+    for iss in issues:
+        key = (iss.get("category"),
+               iss.get("structured_text") or iss.get("question_text") or iss.get("question_id"))
+        if key[1] is not None and key in seen:
+            continue
+        seen.add(key)
+        unique.append(iss)
+    return unique
+
+
+def truncate_tokens(text: str, budget: int) -> str:
+    """Cut text to ~budget tokens, backing off to the last line/word break
+    so the prompt never ends mid-word."""
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind("\n", 0, limit)
+    if cut < limit * 0.8:
+        cut = text.rfind(" ", 0, limit)
+    if cut < limit * 0.8:
+        cut = limit
+    return text[:cut]
+
+
 def collect_issues(verification: dict) -> list[dict]:
     """Extract all issues from a verification result into a flat list."""
     issues = []
@@ -77,89 +340,104 @@ def collect_issues(verification: dict) -> list[dict]:
 
 def has_critical_or_moderate(verification: dict) -> bool:
     """Check if verification has critical or moderate issues."""
+    return bool(analyze_issues(verification)[0])
+
+
+def analyze_issues(verification: dict) -> tuple[list[dict], int, int, int]:
+    """
+    One pass over a verification result.
+    Returns (critical_and_moderate_issues, critical_count, moderate_count, total_issues).
+    """
+    blocking = []
+    crit_count = mod_count = 0
     issues = collect_issues(verification)
     for iss in issues:
-        if iss.get("severity") in ("critical", "moderate"):
-            return True
-    return False
+        sev = iss.get("severity")
+        if sev == "critical":
+            crit_count += 1
+        elif sev == "moderate":
+            mod_count += 1
+        else:
+            continue
+        blocking.append(iss)
+    return blocking, crit_count, mod_count, len(issues)
 
 
 def fix_section(subject: str, section_id: str, client: GeminiClient,
-                max_iterations: int = 3) -> bool:
+                max_iterations: int = 3, struct_file: Path = None,
+                stats: dict = None) -> bool:
     """
     Fix-and-verify loop for a single section.
+    struct_file: the section's structured JSON (from build_struct_index); looked up if omitted.
+    stats: if given, stats[section_id] is set to {"iterations": fix rounds used, "passed": bool}.
     Returns True if section passes, False if max iterations exceeded.
     """
-    fix_prompt_template = (PROMPTS_DIR / "fix_content.txt").read_text(encoding="utf-8")
-    verify_prompt_template = (PROMPTS_DIR / "verify_accuracy.txt").read_text(encoding="utf-8")
+    def done(passed: bool, iterations: int) -> bool:
+        if stats is not None:
+            stats[section_id] = {"iterations": iterations, "passed": passed}
+        return passed
 
     # Load original
-    original_section, original_summary = load_original_data(subject, section_id)
+    original_section, _ = load_original_data(subject, section_id)
     if not original_section:
-        print(f"  ❌ No original data found for {section_id}")
-        return False
+        log.info(f"  ❌ No original data found for {section_id}")
+        return done(False, 0)
 
-    original_text = build_original_text(original_section, original_summary)
+    original_text = load_original_text(subject, section_id)
 
     # Find structured file
     struct_dir = STRUCTURED_DIR / subject
-    struct_file = None
-    for f in struct_dir.glob("*.json"):
-        data = json.loads(f.read_text(encoding="utf-8"))
-        if data.get("section_id") == section_id:
-            struct_file = f
-            break
+    if struct_file is None:
+        struct_file = build_struct_index(subject).get(section_id)
 
     if not struct_file:
-        print(f"  ❌ No structured file found for {section_id}")
-        return False
+        log.info(f"  ❌ No structured file found for {section_id}")
+        return done(False, 0)
 
     # Load current verification result
     verify_dir = struct_dir / "_verification"
     verify_file = verify_dir / f"{section_id}_verification.json"
 
+    seen_hashes = set()  # every structured version this loop has sent or received
+
     for iteration in range(1, max_iterations + 1):
         # Load current structured content
-        structured = json.loads(struct_file.read_text(encoding="utf-8"))
+        structured = _read_json(struct_file)
         sec_title = structured.get("title", section_id)
+        seen_hashes.add(content_hash(structured))
 
         # Check if we have verification results
         if verify_file.exists():
-            verification = json.loads(verify_file.read_text(encoding="utf-8"))
+            verification = _read_json(verify_file)
         else:
             # Run verification first
-            print(f"  🔍 Running initial verification...")
-            verification = run_verification(
-                structured, original_section, original_summary,
-                section_id, sec_title, verify_prompt_template, client
-            )
+            log.info(f"  🔍 Running initial verification...")
+            verification = verify_cached(structured, original_text, section_id, sec_title, client)
             verify_dir.mkdir(exist_ok=True)
-            with open(verify_file, "w", encoding="utf-8") as f:
-                json.dump(verification, f, indent=2, ensure_ascii=False)
+            _save_verification(verify_file, verification)
 
         # Check if already passing
-        if not has_critical_or_moderate(verification):
-            print(f"  ✅ {section_id} PASSES — no critical/moderate issues")
-            return True
+        blocking, crit_count, mod_count, _ = analyze_issues(verification)
+        if not blocking:
+            log.info(f"  ✅ {section_id} PASSES — no critical/moderate issues")
+            return done(True, iteration - 1)
 
-        issues = collect_issues(verification)
-        crit_count = sum(1 for i in issues if i.get("severity") == "critical")
-        mod_count = sum(1 for i in issues if i.get("severity") == "moderate")
-        print(f"\n  🔧 Iteration {iteration}/{max_iterations}: Fixing {crit_count} critical + {mod_count} moderate issues")
+        log.info(f"\n  🔧 Iteration {iteration}/{max_iterations}: Fixing {crit_count} critical + {mod_count} moderate issues")
 
         # Build fix prompt
-        fix_prompt = fix_prompt_template.format(
-            original_content=original_text[:6000],
-            current_structured=json.dumps(structured, indent=2)[:12000],
-            issues_json=json.dumps([i for i in issues if i.get("severity") in ("critical", "moderate")], indent=2),
+        fix_prompt = compile_template(FIX_TEMPLATE)(
+            original_content=truncate_tokens(original_text, FIX_ORIGINAL_TOKENS),
+            # Compact JSON: indentation would spend the budget on whitespace
+            current_structured=truncate_tokens(_dumps(structured), FIX_STRUCTURED_TOKENS),
+            issues_json=_dumps(dedupe_issues(blocking), indent=True),
         )
 
         # Call Gemini 3 Flash to fix
-        print(f"     🔄 Regenerating with fixes...")
+        log.info(f"     🔄 Regenerating with fixes...")
         try:
             fixed = client.restructure(fix_prompt, phase=f"fix_{section_id}_iter{iteration}")
         except Exception as e:
-            print(f"     ❌ Fix failed: {e}")
+            log.info(f"     ❌ Fix failed: {e}")
             continue
 
         # Handle list return
@@ -167,105 +445,227 @@ def fix_section(subject: str, section_id: str, client: GeminiClient,
             if fixed and isinstance(fixed[0], dict) and "levels" in fixed[0]:
                 fixed = fixed[0]
             else:
-                print(f"     ⚠️  Unexpected response format, skipping iteration")
+                log.info(f"     ⚠️  Unexpected response format, skipping iteration")
                 continue
 
         # Validate structure
         struct_issues = validate_restructured(fixed)
         if any("no levels" in i.lower() for i in struct_issues):
-            print(f"     ⚠️  Fix produced invalid structure, skipping")
+            log.info(f"     ⚠️  Fix produced invalid structure, skipping")
             continue
 
+        # Same content as an earlier version: the model is stuck, and re-verifying
+        # identical JSON would only repeat the previous verdict
+        if content_hash(fixed) in seen_hashes:
+            log.info(f"     ⚠️  Model output did not change — aborting, {section_id} needs manual review")
+            return done(False, iteration)
+
         # Save fixed version
-        with open(struct_file, "w", encoding="utf-8") as f:
-            json.dump(fixed, f, indent=2, ensure_ascii=False)
-        print(f"     💾 Saved fixed version")
+        _write_json_atomic(struct_file, fixed)
+        log.info(f"     💾 Saved fixed version")
 
         # Re-verify
-        print(f"     🔍 Re-verifying...")
-        verification = run_verification(
-            fixed, original_section, original_summary,
-            section_id, sec_title, verify_prompt_template, client
-        )
-        with open(verify_file, "w", encoding="utf-8") as f:
-            json.dump(verification, f, indent=2, ensure_ascii=False)
+        log.info(f"     🔍 Re-verifying...")
+        verification = verify_cached(fixed, original_text, section_id, sec_title, client)
+        _save_verification(verify_file, verification)
 
         # Check result
-        new_issues = collect_issues(verification)
-        new_crit = sum(1 for i in new_issues if i.get("severity") == "critical")
-        new_mod = sum(1 for i in new_issues if i.get("severity") == "moderate")
-        print(f"     📊 After fix: {new_crit} critical, {new_mod} moderate")
+        blocking, new_crit, new_mod, _ = analyze_issues(verification)
+        log.info(f"     📊 After fix: {new_crit} critical, {new_mod} moderate")
+
+        if not blocking:
+            log.info(f"  ✅ {section_id} PASSES after {iteration} fix iteration(s)!")
+            return done(True, iteration)
+
+    log.info(f"  ⚠️  {section_id} still has issues after {max_iterations} iterations — needs manual review")
+    return done(False, max_iterations)
+
+
+def _plan_verification_batches(subject: str, section_ids: list[str],
+                               struct_index: dict[str, Path],
+                               batch_size: int = VERIFY_BATCH_SIZE) -> list[list[tuple]]:
+    """Group the sections that have no verification file yet into batch-sized lists
+    of run_verification_batch items. Sections with a cached verification get
+    their file written here and need no request."""
+    verify_dir = STRUCTURED_DIR / subject / "_verification"
+    items = []
+    for sec_id in section_ids:
+        struct_file = struct_index.get(sec_id)
+        verify_file = verify_dir / f"{sec_id}_verification.json"
+        if not struct_file or verify_file.exists():
+            continue
+        data = _read_json(struct_file)
+        original_section, _ = load_original_data(subject, sec_id)
+        if not original_section:
+            continue
+        item = (sec_id, data.get("title", sec_id), data, load_original_text(subject, sec_id))
+        cached = cached_verification(verify_cache_key(item[2], item[3], item[0], item[1]))
+        if cached is not None:
+            verify_dir.mkdir(exist_ok=True)
+            _save_verification(verify_file, cached)
+        else:
+            items.append(item)
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+def _verify_and_save_batch(subject: str, batch: list[tuple], client: GeminiClient) -> None:
+    """Run one packed verification and write a verification file per returned section."""
+    verify_dir = STRUCTURED_DIR / subject / "_verification"
+    ids = [item[0] for item in batch]
+    log.info(f"  🔍 Batch-verifying {', '.join(ids)}...")
+    try:
+        verified = run_verification_batch(batch, VERIFY_BATCH_TEMPLATE, client)
+    except Exception as e:
+        log.info(f"     ❌ Batch verification failed: {e}")
+        return
+    verify_dir.mkdir(exist_ok=True)
+    for sec_id, title, structured, original_content in batch:
+        verification = verified.get(sec_id)
+        if verification is None:
+            continue
+        store_verification(verify_cache_key(structured, original_content, sec_id, title), verification)
+        _save_verification(verify_dir / f"{sec_id}_verification.json", verification)
 
-        if not has_critical_or_moderate(verification):
-            print(f"  ✅ {section_id} PASSES after {iteration} fix iteration(s)!")
-            return True
 
-    print(f"  ⚠️  {section_id} still has issues after {max_iterations} iterations — needs manual review")
-    return False
+def prefetch_verifications(subject: str, section_ids: list[str], client: GeminiClient,
+                           struct_index: dict[str, Path],
+                           batch_size: int = VERIFY_BATCH_SIZE) -> None:
+    """
+    Write the initial verification file for every section that lacks one,
+    verifying `batch_size` sections per request. fix_section picks these files up;
+    sections a batch fails to cover are verified individually there as before.
+    """
+    for batch in _plan_verification_batches(subject, section_ids, struct_index, batch_size):
+        _verify_and_save_batch(subject, batch, client)
 
 
-def run_verification(structured, original_section, original_summary,
-                     section_id, section_title, prompt_template, client):
-    """Run AI verification on structured content."""
-    # Build original text
-    original_parts = []
-    original_parts.append(f"Learning Objectives: {json.dumps(original_section.get('learning_objectives', []))}")
-    for block in original_section.get("content_blocks", []):
-        fmt = block.get("format", "text")
-        content = block.get("content", "")
-        if isinstance(content, str):
-            original_parts.append(f"[{fmt}] {content}")
-        elif isinstance(content, list):
-            original_parts.append(f"[{fmt}] {json.dumps(content)}")
-    if original_summary:
-        original_parts.append(f"Summary: {json.dumps(original_summary)}")
-    original_content = "\n\n".join(original_parts)
-
-    # Build structured text for verification
-    structured_parts = []
+async def fix_sections(subject: str, section_ids: list[str], client: GeminiClient,
+                       max_iterations: int = 3,
+                       concurrency: int = MAX_CONCURRENT_SECTIONS,
+                       struct_index: dict[str, Path] = None,
+                       stats: dict = None) -> dict[str, bool]:
+    """
+    Run fix_section for several sections at once, at most `concurrency` Gemini
+    workers at a time. Sections are independent, so their fix/verify round-trips overlap.
+    
+    Initial verifications go out as packed batches. There is no barrier: sections
+    that already have a verification start fixing right away, and each batched
+    section starts as soon as its own batch returns.
+    Returns {section_id: passed}; a section that raised counts as not passed.
+    stats is passed through to fix_section.
+    """
+    if struct_index is None:
+        struct_index = await asyncio.to_thread(build_struct_index, subject)
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def run_batch(batch):
+        async with sem:
+            await asyncio.to_thread(_verify_and_save_batch, subject, batch, client)
+
+    batches = await asyncio.to_thread(_plan_verification_batches, subject, section_ids, struct_index)
+    batch_task = {}
+    for batch in batches:
+        task = asyncio.create_task(run_batch(batch))
+        for item in batch:
+            batch_task[item[0]] = task
+
+    async def bounded(sec_id):
+        if sec_id in batch_task:
+            await asyncio.wait({batch_task[sec_id]})
+        async with sem:
+            # One record, so the banner can't interleave with another worker's output
+            log.info(f"\n{'─'*50}\n📋 {sec_id}\n{'─'*50}")
+            return await asyncio.to_thread(fix_section, subject, sec_id, client, max_iterations,
+                                           struct_index.get(sec_id), stats)
+
+    outcomes = await asyncio.gather(*(bounded(s) for s in section_ids), return_exceptions=True)
+
+    results = {}
+    for sec_id, outcome in zip(section_ids, outcomes):
+        if isinstance(outcome, BaseException):
+            log.info(f"  ❌ {sec_id} failed: {outcome}")
+            outcome = False
+        results[sec_id] = outcome
+    return results
+
+
+def _question_line(label: str, q: dict) -> str:
+    """One check/apply question as `LABEL: text [a | b | c] CORRECT: b`."""
+    opts = q.get("options", [])
+    cidx = q.get("correct_index")
+    correct = opts[cidx] if isinstance(cidx, int) and 0 <= cidx < len(opts) else "?"
+    return f"{label}: {q.get('question_text','')} [{' | '.join(opts)}] CORRECT: {correct}"
+
+
+def build_structured_text(structured: dict) -> str:
+    """Render structured content as the verifier sees it."""
+    parts = []
     for level in structured.get("levels", []):
-        structured_parts.append(f"=== Level {level.get('level','?')}: {level.get('title','')} ===")
-        for seg in level.get("learn_segments", []):
-            structured_parts.append(f"LEARN: {seg.get('display_text', seg.get('narrator_text', ''))}")
-        for q in level.get("check_questions", []):
-            options_str = " | ".join(q.get("options", []))
-            cidx = q.get("correct_index")
-            opts = q.get("options", [])
-            correct = opts[cidx] if cidx is not None and isinstance(cidx, int) and 0 <= cidx < len(opts) else "?"
-            structured_parts.append(f"Q: {q.get('question_text','')} [{options_str}] CORRECT: {correct}")
+        parts.append(f"=== Level {level.get('level','?')}: {level.get('title','')} ===")
+        parts.extend(f"LEARN: {seg.get('display_text', seg.get('narrator_text', ''))}"
+                     for seg in level.get("learn_segments", []))
+        parts.extend(_question_line("Q", q) for q in level.get("check_questions", []))
         aq = level.get("apply_question")
         if aq:
-            options_str = " | ".join(aq.get("options", []))
-            cidx = aq.get("correct_index")
-            opts = aq.get("options", [])
-            correct = opts[cidx] if cidx is not None and isinstance(cidx, int) and 0 <= cidx < len(opts) else "?"
-            structured_parts.append(f"APPLY: {aq.get('question_text','')} [{options_str}] CORRECT: {correct}")
-    structured_content = "\n".join(structured_parts)
-
-    prompt = prompt_template.format(
-        original_content=original_content[:8000],
-        structured_content=structured_content[:8000],
+            parts.append(_question_line("APPLY", aq))
+    return "\n".join(parts)
+
+
+def run_verification(structured, original_content: str,
+                     section_id, section_title, prompt_template, client):
+    """Run AI verification on structured content.
+    original_content is the rendered source (load_original_text), built once per section."""
+    prompt = compile_template(prompt_template)(
+        original_content=truncate_tokens(original_content, VERIFY_TEXT_TOKENS),
+        structured_content=truncate_tokens(build_structured_text(structured), VERIFY_TEXT_TOKENS),
         section_id=section_id,
         section_title=section_title,
     )
     return client.enrich(prompt, phase=f"verify_{section_id}")
 
 
+def run_verification_batch(items: list[tuple], prompt_template: str, client) -> dict[str, dict]:
+    """
+    Verify several sections in one request.
+    items: (section_id, section_title, structured, original_content)
+    Returns {section_id: verification}; sections missing from the response are left out
+    so the caller can fall back to run_verification for them.
+    """
+    blocks = []
+    for section_id, section_title, structured, original_content in items:
+        blocks.append(
+            f"### SECTION {section_id}: {section_title}\n"
+            f"ORIGINAL:\n{truncate_tokens(original_content, VERIFY_TEXT_TOKENS)}\n\n"
+            f"STRUCTURED:\n{truncate_tokens(build_structured_text(structured), VERIFY_TEXT_TOKENS)}"
+        )
+
+    prompt = compile_template(prompt_template)(sections_block="\n\n---\n\n".join(blocks))
+    ids = [item[0] for item in items]
+    response = client.enrich(prompt, phase=f"verify_batch_{ids[0]}-{ids[-1]}")
+
+    results = response.get("results", []) if isinstance(response, dict) else response
+    wanted = set(ids)
+    by_id = {}
+    for result in results or []:
+        if isinstance(result, dict) and result.get("section_id") in wanted:
+            by_id[result["section_id"]] = result
+    return by_id
+
+
 def run(subject: str, target: str = None, max_iterations: int = 3):
     """Run fix+verify loop on sections."""
     client = GeminiClient()
     struct_dir = STRUCTURED_DIR / subject
 
     if not struct_dir.exists():
-        print(f"No structured content for {subject}")
+        log.info(f"No structured content for {subject}")
         return
 
-    # Collect sections to process
+    # Collect sections to process (the index is reused for every fix_section)
+    struct_index = build_struct_index(subject)
     sections_to_fix = []
-    for sf in sorted(struct_dir.glob("*.json")):
-        data = json.loads(sf.read_text(encoding="utf-8"))
-        sec_id = data.get("section_id", "?")
-
+    for sec_id in struct_index:
         if target:
             if "." in target:
                 if sec_id != target:
@@ -276,30 +676,26 @@ def run(subject: str, target: str = None, max_iterations: int = 3):
 
         sections_to_fix.append(sec_id)
 
-    print(f"{'='*70}")
-    print(f"🔧 FIX & VERIFY LOOP: {subject}")
-    print(f"   Sections: {', '.join(sections_to_fix)}")
-    print(f"   Max iterations per section: {max_iterations}")
-    print(f"{'='*70}")
-
-    results = {}
-    for sec_id in sections_to_fix:
-        print(f"\n{'─'*50}")
-        print(f"📋 {sec_id}")
-        print(f"{'─'*50}")
-        passed = fix_section(subject, sec_id, client, max_iterations)
-        results[sec_id] = passed
-
-    # Summary
-    print(f"\n{'='*70}")
-    print(f"📊 FIX & VERIFY RESULTS")
-    print(f"{'='*70}")
-    for sec_id, passed in results.items():
-        status = "✅ PASSED" if passed else "⚠️  NEEDS MANUAL REVIEW"
-        print(f"  {sec_id}: {status}")
-
-    passed_count = sum(1 for v in results.values() if v)
-    print(f"\n  {passed_count}/{len(results)} sections passed")
+    with background_logging():
+        log.info(f"{'='*70}")
+        log.info(f"🔧 FIX & VERIFY LOOP: {subject}")
+        log.info(f"   Sections: {', '.join(sections_to_fix)}")
+        log.info(f"   Max iterations per section: {max_iterations}")
+        log.info(f"{'='*70}")
+
+        results = asyncio.run(fix_sections(subject, sections_to_fix, client, max_iterations,
+                                           struct_index=struct_index))
+
+        # Summary
+        log.info(f"\n{'='*70}")
+        log.info(f"📊 FIX & VERIFY RESULTS")
+        log.info(f"{'='*70}")
+        for sec_id, passed in results.items():
+            status = "✅ PASSED" if passed else "⚠️  NEEDS MANUAL REVIEW"
+            log.info(f"  {sec_id}: {status}")
+
+        passed_count = sum(1 for v in results.values() if v)
+        log.info(f"\n  {passed_count}/{len(results)} sections passed")
 
     client.print_cost_summary()
     client.save_usage_log(f"usage_fix_verify_{subject}.json")
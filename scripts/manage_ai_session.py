@@ -24,6 +24,9 @@ Usage:
     
     # Summarize a long session
     python scripts/manage_ai_session.py --session my_project_session --summarize
+    
+    # Summarize every session that needs it, concurrently with one client
+    python scripts/manage_ai_session.py --summarize-all
 
 Integration with AI:
     When starting a new chat, an AI agent should:
@@ -34,6 +37,7 @@ Integration with AI:
 """
 
 import sys
+import asyncio
 import argparse
 from pathlib import Path
 from datetime import datetime
@@ -42,10 +46,22 @@ from datetime import datetime
 REPO_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(REPO_ROOT / "scripts"))
 
+# Only the store is imported up front. The Gemini client, summarizer and context
+# cache pull in google.generativeai, so they load in the methods that need them
+# and --list / --clear start without it.
 from utils.conversation_manager import ConversationManager
-from utils.context_cache import ContextCache
-from utils.gemini_client import GeminiClient
-from utils.conversation_summarizer import ConversationSummarizer
+
+# Summary requests in flight at once for summarize_sessions_batch
+SUMMARIZE_CONCURRENCY = 5
+
+# Token budget for the context handed to an agent on resume; history is
+# summarized once it passes 80% of it (1 token ≈ 4 chars)
+SESSION_CONTEXT_TOKENS = 50000
+SUMMARIZE_THRESHOLD_TOKENS = int(0.8 * SESSION_CONTEXT_TOKENS)
+# Once summarizing, recent turns are kept verbatim up to this many tokens (max
+# 10 messages), and an unsummarized span this large is summarized even if short
+RECENT_CONTEXT_TOKENS = SESSION_CONTEXT_TOKENS // 2
+UNSUMMARIZED_MAX_TOKENS = SESSION_CONTEXT_TOKENS // 4
 
 
 class AISessionManager:
@@ -62,7 +78,7 @@ class AISessionManager:
         """
         self.session_id = session_id or self._get_default_session()
         self.conversation_manager = ConversationManager(session_id=self.session_id)
-        self.context_cache = ContextCache()
+        self._context_cache = None  # Lazy-loaded when needed
         self.client = None  # Lazy-loaded when needed
     
     def _get_default_session(self) -> str:
@@ -70,9 +86,18 @@ class AISessionManager:
         # Use project name + date as default
         return f"mcat_project_{datetime.now().strftime('%Y%m%d')}"
     
-    def _get_client(self) -> GeminiClient:
+    @property
+    def context_cache(self):
+        """Lazy-load the context cache."""
+        if self._context_cache is None:
+            from utils.context_cache import ContextCache
+            self._context_cache = ContextCache()
+        return self._context_cache
+    
+    def _get_client(self) -> "GeminiClient":
         """Lazy-load Gemini client."""
         if not self.client:
+            from utils.gemini_client import GeminiClient
             self.client = GeminiClient(enable_caching=True, conversation_id=self.session_id)
         return self.client
     
@@ -136,37 +161,69 @@ class AISessionManager:
             print(f"⚠️  Could not load project context: {e}")
     
     def _get_session_context(self) -> dict:
-        """Get optimized session context for AI agent."""
+        """Get optimized session context for AI agent (reused while the history is unchanged)."""
+        fingerprint = self.conversation_manager.history_fingerprint()
+        context = self.context_cache.get_resume_context(self.session_id, fingerprint)
+        if context is None:
+            context = self._build_session_context()
+            self.context_cache.set_resume_context(self.session_id, fingerprint, context)
+        return context
+    
+    @staticmethod
+    def _recent_count(history: list) -> int:
+        """How many trailing messages (1-10) fit in RECENT_CONTEXT_TOKENS."""
+        count, chars = 0, 0
+        for msg in reversed(history[-10:]):
+            chars += len(msg["content"])
+            if count and chars // 4 > RECENT_CONTEXT_TOKENS:
+                break
+            count += 1
+        return count
+    
+    def _build_session_context(self) -> dict:
+        """Build optimized session context for AI agent."""
         history = self.conversation_manager.get_history()
         
-        # Check if we need summarization
-        needs_summary = len(history) > 50
+        # Summarize by size, not message count: many short turns fit fine, a few huge ones don't
+        needs_summary = self.conversation_manager.total_tokens > SUMMARIZE_THRESHOLD_TOKENS
         
         if needs_summary:
-            # Create optimized context
+            # Extend the stored summary with turns since the last resume only
+            from utils.conversation_summarizer import ConversationSummarizer
+            metadata = self.conversation_manager.metadata
+            keep_recent = self._recent_count(history)
             summarizer = ConversationSummarizer(self._get_client())
-            optimized = summarizer.create_context_optimized_history(
+            summary = summarizer.incremental_summarize(
                 self.conversation_manager,
-                max_tokens=50000  # Keep context manageable
+                metadata.get("cached_summary"),
+                metadata.get("summarized_upto", 0),
+                keep_recent=keep_recent,
+                history=history,
+                batch_tokens=UNSUMMARIZED_MAX_TOKENS
             )
             
             context_text = ""
-            if optimized['summary']:
-                context_text += optimized['summary'] + "\n\n"
+            if summary:
+                context_text += summary + "\n\n"
             
-            # Add recent messages
-            for msg in optimized['recent_messages'][-10:]:  # Last 10 messages
+            # Add recent messages, plus any turns the summary doesn't cover yet
+            recent_messages = history[min(metadata.get("summarized_upto", 0), len(history) - keep_recent):]
+            for msg in recent_messages:
                 context_text += f"{msg['role'].upper()}: {msg['content']}\n\n"
             
             return {
                 "session_id": self.session_id,
                 "message_count": len(history),
-                "has_summary": True,
-                "summary": optimized['summary'],
-                "recent_messages": optimized['recent_messages'][-10:],
+                "has_summary": summary is not None,
+                "summary": summary,
+                "recent_messages": recent_messages,
                 "context": context_text,
                 "estimated_tokens": len(context_text) // 4,
-                "optimization": optimized['optimization_info']
+                "optimization": {
+                    "total_messages": len(history),
+                    "summarized_upto": metadata.get("summarized_upto", 0),
+                    "selected_count": len(recent_messages)
+                }
             }
         else:
             # Return full context
@@ -176,7 +233,7 @@ class AISessionManager:
                 "message_count": len(history),
                 "has_summary": False,
                 "context": context_text,
-                "estimated_tokens": len(context_text) // 4
+                "estimated_tokens": self.conversation_manager.total_tokens
             }
     
     def add_interaction(self, user_message: str, assistant_response: str, metadata: dict = None):
@@ -188,9 +245,10 @@ class AISessionManager:
             assistant_response: Assistant's response
             metadata: Optional metadata (tokens, cost, phase)
         """
-        self.conversation_manager.add_message("user", user_message, metadata)
-        self.conversation_manager.add_message("assistant", assistant_response, metadata)
-        self.conversation_manager.save()
+        self.conversation_manager.add_messages([
+            ("user", user_message, metadata),
+            ("assistant", assistant_response, metadata),
+        ])
     
     def summarize_session(self):
         """Manually trigger session summarization."""
@@ -198,6 +256,7 @@ class AISessionManager:
         print(f"📝 SUMMARIZING SESSION: {self.session_id}")
         print(f"{'='*60}\n")
         
+        from utils.conversation_summarizer import ConversationSummarizer
         summarizer = ConversationSummarizer(self._get_client())
         summary = summarizer.summarize_conversation(self.conversation_manager, keep_recent=20)
         
@@ -212,6 +271,60 @@ class AISessionManager:
         print(f"\n✅ Session summarized and saved")
         return summary
     
+    @staticmethod
+    def summarize_sessions_batch(session_ids: list, keep_recent: int = 20) -> dict:
+        """
+        Summarize several sessions with one shared client, overlapping the calls.
+        
+        Sessions with keep_recent messages or fewer are skipped. Summaries are stored
+        like summarize_session does; the database writes happen back on this thread.
+        
+        Returns:
+            {session_id: summary} for the sessions that were summarized
+        """
+        managers = [ConversationManager(session_id=sid) for sid in session_ids]
+        pending = [cm for cm in managers if len(cm.messages) > keep_recent]
+        print(f"\n📝 Summarizing {len(pending)}/{len(managers)} sessions "
+              f"({SUMMARIZE_CONCURRENCY} at a time)")
+        
+        summaries = {}
+        if pending:
+            from utils.gemini_client import GeminiClient
+            from utils.conversation_summarizer import ConversationSummarizer
+            summarizer = ConversationSummarizer(GeminiClient(enable_caching=True))
+            
+            async def summarize_all():
+                sem = asyncio.Semaphore(SUMMARIZE_CONCURRENCY)
+                
+                async def bounded(cm):
+                    async with sem:
+                        return await asyncio.to_thread(
+                            summarizer.summarize_conversation, cm, keep_recent)
+                
+                return await asyncio.gather(*(bounded(cm) for cm in pending),
+                                            return_exceptions=True)
+            
+            outcomes = asyncio.run(summarize_all())
+            for cm, summary in zip(pending, outcomes):
+                if isinstance(summary, BaseException):
+                    print(f"❌ {cm.session_id}: {summary}")
+                    continue
+                if summary.startswith("No summarization needed"):
+                    continue
+                cm.add_message(
+                    "system",
+                    summary,
+                    metadata={"type": "summary", "timestamp": datetime.now().isoformat()}
+                )
+                cm.save()
+                summaries[cm.session_id] = summary
+        
+        for cm in managers:
+            cm.close()
+        
+        print(f"\n✅ Summarized {len(summaries)} sessions")
+        return summaries
+    
     def get_session_stats(self) -> dict:
         """Get statistics about the current session."""
         summary = self.conversation_manager.export_summary()
@@ -224,33 +337,36 @@ class AISessionManager:
     
     def print_session_info(self):
         """Print detailed session information."""
-        print(f"\n{'='*60}")
-        print(f"📊 SESSION INFO: {self.session_id}")
-        print(f"{'='*60}\n")
-        
         stats = self.get_session_stats()
         session = stats['session']
         caching = stats['caching']
+        rule = '=' * 60
         
-        print(f"Messages:")
-        print(f"  Total: {session['message_count']}")
-        print(f"  By role: {session['roles_breakdown']}")
-        
+        # Built up front and written once rather than line by line
+        time_span = ""
         if session['time_span']:
-            print(f"\nTime span:")
-            print(f"  Start: {session['time_span']['start']}")
-            print(f"  End: {session['time_span']['end']}")
-        
-        print(f"\nToken estimates:")
-        print(f"  Total: {session['estimated_total_tokens']:,}")
+            time_span = (f"\nTime span:\n"
+                         f"  Start: {session['time_span']['start']}\n"
+                         f"  End: {session['time_span']['end']}\n")
         
-        print(f"\nContext caching:")
-        print(f"  Active caches: {caching['active_caches']}")
-        print(f"  Total created: {caching['total_created']}")
-        print(f"  Cache hits: {caching['total_hits']}")
-        print(f"  Cost savings: ${caching['estimated_cost_savings']:.4f}")
-        
-        print(f"\n{'='*60}\n")
+        sys.stdout.write(
+            f"\n{rule}\n"
+            f"📊 SESSION INFO: {self.session_id}\n"
+            f"{rule}\n\n"
+            f"Messages:\n"
+            f"  Total: {session['message_count']}\n"
+            f"  By role: {session['roles_breakdown']}\n"
+            f"{time_span}"
+            f"\nToken estimates:\n"
+            f"  Total: {session['estimated_total_tokens']:,}\n"
+            f"\nContext caching:\n"
+            f"  Active caches: {caching['active_caches']}\n"
+            f"  Total created: {caching['total_created']}\n"
+            f"  Cache hits: {caching['total_hits']}\n"
+            f"  Cost savings: ${caching['estimated_cost_savings']:.4f}\n"
+            f"\n{rule}\n\n"
+        )
+        sys.stdout.flush()
     
     def clear_session(self):
         """Clear the current session."""
@@ -260,23 +376,22 @@ class AISessionManager:
     @staticmethod
     def list_all_sessions():
         """List all available sessions."""
-        print(f"\n{'='*60}")
-        print(f"📋 ALL AI AGENT SESSIONS")
-        print(f"{'='*60}\n")
+        rule = '=' * 60
+        header = f"\n{rule}\n📋 ALL AI AGENT SESSIONS\n{rule}\n\n"
         
         sessions = ConversationManager.list_all_sessions()
         
         if not sessions:
-            print("📭 No sessions found")
+            sys.stdout.write(f"{header}📭 No sessions found\n")
             return
         
-        for session in sessions:
-            print(f"  • {session['session_id']}")
-            print(f"    Messages: {session['message_count']}")
-            print(f"    Last updated: {session['last_updated']}")
-            print()
-        
-        print(f"{'='*60}\n")
+        sys.stdout.write(header + "".join(
+            f"  • {session['session_id']}\n"
+            f"    Messages: {session['message_count']}\n"
+            f"    Last updated: {session['last_updated']}\n\n"
+            for session in sessions
+        ) + f"{rule}\n\n")
+        sys.stdout.flush()
 
 
 def main():
@@ -303,6 +418,11 @@ def main():
         action="store_true",
         help="Manually summarize session"
     )
+    parser.add_argument(
+        "--summarize-all",
+        action="store_true",
+        help="Summarize every session that needs it (concurrent, one client)"
+    )
     parser.add_argument(
         "--clear",
         action="store_true",
@@ -321,6 +441,11 @@ def main():
         AISessionManager.list_all_sessions()
         return
     
+    if args.summarize_all:
+        session_ids = [s['session_id'] for s in ConversationManager.list_all_sessions()]
+        AISessionManager.summarize_sessions_batch(session_ids)
+        return
+    
     # Require session ID for other operations
     if not args.session and not args.list:
         print("❌ Error: --session required (or use --list)")
@@ -8,8 +8,12 @@ Example:
     python scripts/migrate_outputs_to_phases.py --force
 """
 import argparse
+import re
 import shutil
 import os
+import sys
+import stat
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -35,43 +39,97 @@ MAPPING = {
     PROJECT_ROOT / "audio": AUDIO_DIR,
 }
 
+# Root-level usage_*.json routing: first matching rule wins, else USAGE_DEFAULT_DIR
+USAGE_DEFAULT_DIR = EXTRACTED_DIR.parent / "usage"  # phases/phase1/output/usage
+_USAGE_RULES = [
+    (re.compile(r"^usage_phase[123]_"), USAGE_DEFAULT_DIR),
+    (re.compile(r"fix"), PROJECT_ROOT / "phases" / "phase6_1" / "output" / "usage"),
+]
+
+# Concurrent item moves (shared across all mappings); moves are syscall/IO-bound
+MAX_MOVE_WORKERS = 16
+
 
 def _ensure_parent(d: Path):
     d.parent.mkdir(parents=True, exist_ok=True)
 
 
-def move_dir(src: Path, dst: Path, force: bool = False, dry_run: bool = True):
+def _move_item(item: Path, dest_item: Path, force: bool):
+    """Move one entry, clearing a conflicting destination first when forced.
+    Every item has its own dest_item, so concurrent calls never share a target."""
+    try:
+        dest_stat = os.lstat(dest_item)  # one stat answers both "exists" and "is a dir"
+    except FileNotFoundError:
+        dest_stat = None
+    if dest_stat is not None:
+        if force:
+            if stat.S_ISDIR(dest_stat.st_mode):
+                shutil.rmtree(dest_item)
+            else:
+                dest_item.unlink()
+        else:
+            print(f"    ⚠️  Skipping existing: {dest_item} (use --force to overwrite)")
+            return
+    print(f"    moving {item} → {dest_item}")
+    try:
+        os.replace(item, dest_item)  # same filesystem: one rename, no data copied
+    except OSError:  # cross-device
+        shutil.move(str(item), str(dest_item))
+
+
+def move_dir(src: Path, dst: Path, force: bool = False, dry_run: bool = True,
+             executor: ThreadPoolExecutor = None):
     if not src.exists():
         print(f"  ⏭️  Source not found: {src}")
         return
 
     print(f"  Moving: {src} → {dst}")
     if dry_run:
-        # list items that would be moved
-        for p in sorted(src.iterdir()):
-            print(f"    would move: {p} → {dst / p.name}")
-        return
+        _preview(src, dst)
+    else:
+        _apply(src, dst, force, executor)
+
 
+def _preview(src: Path, dst: Path):
+    """List the items that would be moved: directory order, one write, no stat calls."""
+    with os.scandir(src) as it:
+        lines = [f"    would move: {entry.path} → {dst}{os.sep}{entry.name}\n" for entry in it]
+    sys.stdout.write("".join(lines))
+
+
+def _apply(src: Path, dst: Path, force: bool, executor: ThreadPoolExecutor = None):
+    """Move src's contents into dst (see move_dir)."""
     _ensure_parent(dst)
+    if not dst.exists():
+        # Nothing to merge into: move the whole tree with one rename
+        try:
+            os.rename(src, dst)
+            print("    moved directory in one step")
+            return
+        except OSError:  # cross-device, fall back to per-item moves
+            pass
     dst.mkdir(parents=True, exist_ok=True)
 
-    for item in sorted(src.iterdir()):
-        dest_item = dst / item.name
-        if dest_item.exists():
-            if force:
-                if dest_item.is_dir():
-                    shutil.rmtree(dest_item)
-                else:
-                    dest_item.unlink()
-            else:
-                print(f"    ⚠️  Skipping existing: {dest_item} (use --force to overwrite)")
-                continue
-        print(f"    moving {item} → {dest_item}")
-        shutil.move(str(item), str(dest_item))
+    pool = executor or ThreadPoolExecutor(max_workers=MAX_MOVE_WORKERS)
+    try:
+        # Completion order is arbitrary anyway, so no need to sort the listing
+        with os.scandir(src) as it:
+            futures = {pool.submit(_move_item, Path(entry.path), dst / entry.name, force): entry.path
+                       for entry in it}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"    ❌ Failed to move {futures[future]}: {e}")
+    finally:
+        if executor is None:
+            pool.shutdown()
 
     # if source dir is empty after moving, remove it
     try:
-        if not any(src.iterdir()):
+        with os.scandir(src) as it:
+            empty = next(it, None) is None
+        if empty:
             src.rmdir()
             print(f"    removed empty source dir: {src}")
     except Exception:
@@ -91,8 +149,16 @@ if __name__ == "__main__":
     if args.dry_run or not any(s.exists() for s in MAPPING.keys()):
         print("\nRunning dry-run (preview). To actually move files, rerun without --dry-run or pass --force to overwrite conflicts.)")
 
-    for src, dst in MAPPING.items():
-        move_dir(src, dst, force=args.force, dry_run=args.dry_run)
+    if args.dry_run:
+        for src, dst in MAPPING.items():
+            move_dir(src, dst, force=args.force, dry_run=True)
+    else:
+        # Mappings touch disjoint directories: run them side by side, feeding one item pool
+        with ThreadPoolExecutor(max_workers=MAX_MOVE_WORKERS) as items, \
+                ThreadPoolExecutor(max_workers=len(MAPPING)) as dirs:
+            list(dirs.map(lambda sd: move_dir(sd[0], sd[1], force=args.force, dry_run=False,
+                                              executor=items),
+                          MAPPING.items()))
 
     # Move any usage_*.json files at project root into the appropriate phase usage folders
     usage_files = sorted([p for p in PROJECT_ROOT.glob("usage_*.json") if p.is_file()])
@@ -102,17 +168,13 @@ if __name__ == "__main__":
             print(f"  {f.name}")
         print("\nMapping usage logs to phase usage folders...")
 
-    for f in usage_files:
-        name = f.name
-        if name.startswith("usage_phase3_") or name.startswith("usage_phase1_") or name.startswith("usage_phase2_"):
-            dest = EXTRACTED_DIR.parent / "usage"  # phases/phase1/output/usage
-        elif name.startswith("usage_fix_verify_") or "fix" in name:
-            dest = PROJECT_ROOT / "phases" / "phase6_1" / "output" / "usage"
-        else:
-            # fallback to phase1 usage folder
-            dest = EXTRACTED_DIR.parent / "usage"
-
+    usage_dests = {f: next((d for rx, d in _USAGE_RULES if rx.search(f.name)), USAGE_DEFAULT_DIR)
+                   for f in usage_files}
+    for dest in set(usage_dests.values()):
         dest.mkdir(parents=True, exist_ok=True)
+
+    for f, dest in usage_dests.items():
+        name = f.name
         target = dest / name
         print(f"  Moving {f} → {target}")
         if args.dry_run:
@@ -2,7 +2,8 @@
 Parallel Pipeline Orchestrator — Uses 5 API keys to process all 7 MCAT books.
 
 Distributes work across 5 workers (each with its own API key), respecting phase
-dependencies and tracking progress. Processes Phases 2-9 in dependency waves.
+dependencies and tracking progress. Phases 2-9 are grouped into dependency waves
+for planning; each item starts as soon as the items it depends on have finished.
 
 Usage:
     python scripts/parallel_pipeline.py                     # Full run
@@ -13,14 +14,17 @@ Usage:
 
 import sys
 import os
+import re
 import json
 import time
+import queue
+import threading
 import subprocess
 import argparse
 from pathlib import Path
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from collections import defaultdict
+from collections import defaultdict, deque
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(REPO_ROOT))
@@ -32,34 +36,134 @@ if sys.platform == "win32":
     sys.stderr.reconfigure(encoding="utf-8", errors="replace")
 
 # ─── Book definitions ───────────────────────────────────────
-BOOKS = {
-    "MCAT Biology Review.pdf":                         "biology",
-    "MCAT Biochemistry Review.pdf":                    "biochemistry",
-    "MCAT General Chemistry Review.pdf":               "gen_chem",
-    "MCAT Organic Chemistry Review.pdf":               "org_chem",
-    "MCAT Physics and Math Review.pdf":                "physics",
-    "MCAT Behavioral Sciences Review.pdf":             "psych_soc",
-    "MCAT Critical Analysis and Reasoning Skills Review.pdf": "cars",
-}
+# Single source of truth lives in config; re-exported here for auto_wave_runner
+from config import (
+    BOOKS, ASSETS_DIR, TOC_DIR, ASSESSMENTS_DIR, SECTIONS_DIR, GLOSSARY_DIR,
+    FIGURE_CATALOG_DIR, ENRICHED_ASSESSMENTS_DIR, VERIFIED_ASSESSMENTS_DIR,
+    PRIMITIVES_DIR, STRUCTURED_DIR, COMPILED_DIR, VERIFIED_STRUCTURED_DIR, BRIDGES_DIR,
+)
+from parallel_worker import RESULT_PREFIX
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 NUM_KEYS = 5
 NUM_CHAPTERS = 12  # All books have 12 chapters
 
+# Written while waves are executing so watchers (auto_wave_runner) can wait on the PID
+PID_FILE = REPO_ROOT / "logs" / "parallel_pipeline.pid"
+
 # ─── Output directories ────────────────────────────────────
 PHASE_OUTPUT_DIRS = {
-    0:   REPO_ROOT / "phases" / "phase0"  / "output" / "assets",
-    1:   REPO_ROOT / "phases" / "phase1"  / "output" / "extracted",
-    2:   REPO_ROOT / "phases" / "phase2"  / "output" / "extracted",
-    3:   REPO_ROOT / "phases" / "phase3"  / "output" / "extracted",
-    4:   REPO_ROOT / "phases" / "phase4"  / "output" / "extracted",
-    5:   REPO_ROOT / "phases" / "phase5"  / "output" / "extracted",
-    6:   REPO_ROOT / "phases" / "phase6"  / "output",
-    6.1: REPO_ROOT / "phases" / "phase6_1"/ "output" / "verified",
-    7:   REPO_ROOT / "phases" / "phase7"  / "output" / "primitives",
-    8:   REPO_ROOT / "phases" / "phase8"  / "output" / "structured",
-    8.1: REPO_ROOT / "phases" / "phase8_1"/ "output" / "compiled",
-    8.2: REPO_ROOT / "phases" / "phase8_2"/ "output" / "verified",
-    9:   REPO_ROOT / "phases" / "phase9"  / "output" / "bridges",
+    0:   ASSETS_DIR,
+    1:   TOC_DIR,
+    2:   ASSESSMENTS_DIR,
+    3:   SECTIONS_DIR,
+    4:   GLOSSARY_DIR,
+    5:   FIGURE_CATALOG_DIR,
+    6:   ENRICHED_ASSESSMENTS_DIR,
+    6.1: VERIFIED_ASSESSMENTS_DIR,
+    7:   PRIMITIVES_DIR,
+    8:   STRUCTURED_DIR,
+    8.1: COMPILED_DIR,
+    8.2: VERIFIED_STRUCTURED_DIR,
+    9:   BRIDGES_DIR,
+}
+
+
+MATRIX_PHASES = [0, 1, 2, 3, 4, 5, 6, 6.1, 7, 8, 8.1, 8.2]
+
+# Per-chapter output filenames; group 1 is the chapter number.
+_CH_ASSESSMENT = re.compile(r"ch(\d{2})_assessment\.json")
+_DOTTED_SECTION = re.compile(r"(\d+)\..*-.*\.json")
+CHAPTER_FILE_PATTERNS = {
+    2:   _CH_ASSESSMENT,
+    3:   re.compile(r"ch(\d{2})_.*\.json"),
+    5:   re.compile(r"ch(\d{2})_figure_catalog\.json"),
+    6:   _CH_ASSESSMENT,
+    6.1: _CH_ASSESSMENT,
+    7:   re.compile(r"(\d+)\..*json"),
+    8:   _DOTTED_SECTION,
+    8.1: re.compile(r"(\d+)\..*_modes\.json"),
+    8.2: _DOTTED_SECTION,
+}
+
+
+def _scan_names(directory):
+    """All entry names in `directory` (empty set if it doesn't exist)."""
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name for entry in it}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
+def _chapters_present(names, pattern):
+    """Chapter numbers with a file matching `pattern` (group 1 = chapter)."""
+    chapters = set()
+    for name in names:
+        m = pattern.fullmatch(name)
+        if m:
+            chapters.add(int(m.group(1)))
+    return chapters
+
+
+def _file_check(filename):
+    return lambda subj_dir, chapter: (subj_dir / filename).exists()
+
+
+def _chapter_check(phase, chapter_file, book_pattern, min_count):
+    """Check for a per-chapter phase.
+
+    With a chapter: that chapter's `chapter_file` exists, or, when the name
+    isn't fixed, some file matches CHAPTER_FILE_PATTERNS[phase] for it.
+    Without: at least `min_count` files match `book_pattern` ("most chapters").
+    """
+    book_regex = re.compile(book_pattern)
+    
+    def check(subj_dir, chapter):
+        if chapter:
+            if chapter_file:
+                return (subj_dir / chapter_file.format(chapter=chapter)).exists()
+            return chapter in _chapters_present(_scan_names(subj_dir), CHAPTER_FILE_PATTERNS[phase])
+        return sum(1 for name in _scan_names(subj_dir) if book_regex.fullmatch(name)) >= min_count
+    return check
+
+
+def _check_phase0(subj_dir, chapter):
+    # Phase 0 outputs are in assets/{subject}/ — check any images exist
+    try:
+        with os.scandir(subj_dir) as it:
+            return next(it, None) is not None
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+def _check_phase5(subj_dir, chapter):
+    if chapter:
+        return (subj_dir / f"ch{chapter:02d}_figure_catalog.json").exists()
+    return (subj_dir / "_figure_catalog.json").exists()
+
+
+# phase -> check(subj_dir, chapter). Book-wide patterns mirror the globs the
+# checks used to run ("ch*_assessment.json", "[0-9]*-*.json", ...).
+PHASE_CHECKS = {
+    0:   _check_phase0,
+    1:   _file_check("_toc.json"),
+    2:   _chapter_check(2, "ch{chapter:02d}_assessment.json", r"ch.*_assessment\.json", 10),
+    3:   _chapter_check(3, None, r"ch[0-9].*_.*\.json", 10),
+    4:   _file_check("_glossary.json"),
+    5:   _check_phase5,
+    6:   _chapter_check(6, "ch{chapter:02d}_assessment.json", r"ch.*_assessment\.json", 10),
+    6.1: _chapter_check(6.1, "ch{chapter:02d}_assessment.json", r"ch.*_assessment\.json", 10),
+    7:   _chapter_check(7, None, r"[^.].*\.json", 5),
+    8:   _chapter_check(8, None, r"[0-9].*-.*\.json", 5),
+    8.1: _chapter_check(8.1, None, r"[^.].*_modes\.json", 5),
+    8.2: _chapter_check(8.2, None, r"[0-9].*-.*\.json", 5),
+    # Phase 9 is cross-book: its graph sits directly in BRIDGES_DIR
+    9:   lambda subj_dir, chapter: (subj_dir.parent / "_bridge_graph.json").exists(),
 }
 
 
@@ -71,88 +175,105 @@ def check_phase_done(phase: float, subject: str, chapter: int = None) -> bool:
         return True  # Skip these — CARS is passage-comprehension only
     
     base = PHASE_OUTPUT_DIRS.get(phase)
-    if not base:
+    if not base or phase not in PHASE_CHECKS:
         return False
+    return PHASE_CHECKS[phase](base / subject, chapter)
+
+
+def _phase_status(phase, subject, names):
+    """Matrix cell for one phase/subject from its directory listing."""
+    # CARS doesn't produce output for assessment/glossary/figure phases
+    cars_skip = subject == "cars" and phase in [2, 4, 5]
+    if phase == 4:  # Book-wide phase
+        return {"done": cars_skip or "_glossary.json" in names}
     
-    subj_dir = base / subject
-    
-    if phase == 0:
-        # Phase 0 outputs are in assets/{subject}/ — check any images exist
-        return subj_dir.exists() and any(subj_dir.iterdir())
-    
+    chapters = range(1, NUM_CHAPTERS + 1)
+    if cars_skip:
+        done_chapters = set(chapters)
+    elif phase == 0:
+        done_chapters = set(chapters) if names else set()
     elif phase == 1:
-        return (subj_dir / "_toc.json").exists()
-    
-    elif phase == 2:
-        if chapter:
-            return (subj_dir / f"ch{chapter:02d}_assessment.json").exists()
-        return len(list(subj_dir.glob("ch*_assessment.json"))) >= 10  # Most chapters
-    
-    elif phase == 3:
-        if chapter:
-            return any(subj_dir.glob(f"ch{chapter:02d}_*.json"))
-        return len(list(subj_dir.glob("ch[0-9]*_*.json"))) >= 10
-    
-    elif phase == 4:
-        return (subj_dir / "_glossary.json").exists()
-    
-    elif phase == 5:
-        if chapter:
-            return (subj_dir / f"ch{chapter:02d}_figure_catalog.json").exists()
-        return (subj_dir / "_figure_catalog.json").exists()
-    
-    elif phase == 6:
-        # Phase 6 output is under phase6/output/{subject}/
-        p6_dir = REPO_ROOT / "phases" / "phase6" / "output" / subject
-        if chapter:
-            return (p6_dir / f"ch{chapter:02d}_assessment.json").exists()
-        return p6_dir.exists() and len(list(p6_dir.glob("ch*_assessment.json"))) >= 10
-    
-    elif phase == 6.1:
-        if chapter:
-            return (subj_dir / f"ch{chapter:02d}_assessment.json").exists()
-        return subj_dir.exists() and len(list(subj_dir.glob("ch*_assessment.json"))) >= 10
-    
-    elif phase == 7:
-        if chapter:
-            return any(subj_dir.glob(f"{chapter}.*json"))
-        return subj_dir.exists() and len(list(subj_dir.glob("*.json"))) >= 5
-    
-    elif phase == 8:
-        if chapter:
-            return any(subj_dir.glob(f"{chapter}.*-*.json"))
-        return subj_dir.exists() and len(list(subj_dir.glob("[0-9]*-*.json"))) >= 5
-    
-    elif phase == 8.1:
-        if chapter:
-            return any(subj_dir.glob(f"{chapter}.*_modes.json"))
-        return subj_dir.exists() and len(list(subj_dir.glob("*_modes.json"))) >= 5
-    
-    elif phase == 8.2:
-        if chapter:
-            return any(subj_dir.glob(f"{chapter}.*-*.json"))
-        return subj_dir.exists() and len(list(subj_dir.glob("[0-9]*-*.json"))) >= 5
-    
-    elif phase == 9:
-        return (base / "_bridge_graph.json").exists()
+        done_chapters = set(chapters) if "_toc.json" in names else set()
+    else:
+        done_chapters = _chapters_present(names, CHAPTER_FILE_PATTERNS[phase])
+    return {ch: ch in done_chapters for ch in chapters}
+
+
+# Completion matrix cache: one entry per output directory, reused while the
+# directory's mtime is unchanged (adding/removing a file bumps it).
+MANIFEST_FILE = REPO_ROOT / "logs" / "completion_manifest.json"
+MANIFEST_VERSION = 1  # bump when CHAPTER_FILE_PATTERNS or _phase_status change
+
+
+def _dir_mtime_ns(directory):
+    try:
+        return os.stat(directory).st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return -1
+
+
+def _load_manifest():
+    try:
+        with open(MANIFEST_FILE, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("dirs", {})
+
+
+def _save_manifest(entries):
+    MANIFEST_FILE.parent.mkdir(exist_ok=True)
+    tmp = MANIFEST_FILE.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "dirs": entries}, f, separators=(",", ":"))
+    os.replace(tmp, MANIFEST_FILE)
+
+
+def _cached_status(manifest, entries, key, directory, compute):
+    """Status for `directory`: from the manifest if its mtime matches, else `compute(names)`."""
+    mtime = _dir_mtime_ns(directory)
+    cached = manifest.get(key)
+    if cached and cached["mtime_ns"] == mtime:
+        done = cached["done"]
+        status = {"done": done} if isinstance(done, bool) else \
+            {ch: ch in set(done) for ch in range(1, NUM_CHAPTERS + 1)}
+    else:
+        status = compute(_scan_names(directory))
     
-    return False
+    done = status["done"] if "done" in status else [ch for ch, ok in status.items() if ok]
+    entries[key] = {"mtime_ns": mtime, "done": done}
+    return status
 
 
 def get_completion_matrix():
-    """Build a matrix of what's done vs what needs doing."""
+    """Build a matrix of what's done vs what needs doing.
+
+    Lists each output directory once and matches filenames in memory rather
+    than calling check_phase_done per chapter. Directories whose mtime is
+    unchanged since the last run are taken from MANIFEST_FILE without listing.
+    """
+    manifest = _load_manifest()
+    entries = {}
     matrix = {}
     for pdf, subject in BOOKS.items():
         matrix[subject] = {}
-        for phase in [0, 1, 2, 3, 4, 5, 6, 6.1, 7, 8, 8.1, 8.2]:
-            if phase in [4]:  # Book-wide phases 
-                matrix[subject][phase] = {"done": check_phase_done(phase, subject)}
-            else:
-                chapter_status = {}
-                for ch in range(1, NUM_CHAPTERS + 1):
-                    chapter_status[ch] = check_phase_done(phase, subject, ch)
-                matrix[subject][phase] = chapter_status
-    matrix["_global"] = {9: {"done": check_phase_done(9, "global")}}
+        for phase in MATRIX_PHASES:
+            matrix[subject][phase] = _cached_status(
+                manifest, entries, f"{phase}/{subject}", PHASE_OUTPUT_DIRS[phase] / subject,
+                lambda names, phase=phase, subject=subject: _phase_status(phase, subject, names),
+            )
+    matrix["_global"] = {9: _cached_status(
+        manifest, entries, "9/global", BRIDGES_DIR,
+        lambda names: {"done": "_bridge_graph.json" in names},
+    )}
+    
+    if entries != manifest:
+        try:
+            _save_manifest(entries)
+        except OSError:
+            pass  # cache only — the matrix itself is already correct
     return matrix
 
 
@@ -287,98 +408,395 @@ def generate_work_items(matrix):
 
 
 # Pre-load API keys at module level (before any threading)
+_ENV_LINE = re.compile(r"^[ \t]*([^#\s=][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t]*$", re.MULTILINE)
+
+
 def _load_env_values():
     """Load .env values once at startup."""
     env_path = REPO_ROOT / ".env"
-    vals = {}
-    if env_path.exists():
-        with open(env_path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    k, v = line.split("=", 1)
-                    vals[k.strip()] = v.strip()
-    return vals
+    if not env_path.exists():
+        return {}
+    return dict(_ENV_LINE.findall(env_path.read_text(encoding="utf-8")))
 
 _ENV_VALS = _load_env_values()
 
 
+def _build_worker_env(key_index):
+    env = os.environ.copy()
+    # Also pass through Google Cloud creds
+    env.update({k: v for k, v in _ENV_VALS.items() if k.startswith("GOOGLE_")})
+    env["GEMINI_API_KEY"] = _ENV_VALS.get(f"GEMINI_API_KEY_{key_index + 1}",
+                                          _ENV_VALS.get("GEMINI_API_KEY", ""))
+    return env
+
+# Worker environments, built once — the process env is fixed for the run
+PER_KEY_ENV = [_build_worker_env(i) for i in range(NUM_KEYS)]
+
+
+def _worker_env(key_index):
+    """Environment for a worker process bound to API key `key_index`."""
+    if key_index < len(PER_KEY_ENV):
+        return PER_KEY_ENV[key_index]
+    return _build_worker_env(key_index)  # --workers above NUM_KEYS
+
+
+WORKER_TIMEOUT = 900  # 15 min timeout per work item
+OUTPUT_TAIL_LINES = 200  # worker stderr kept per job for error summaries
+
+
+class WorkerProcess:
+    """A long-lived `parallel_worker.py --serve` process bound to one API key.
+
+    genai.configure() is process-global, so each key keeps its own process;
+    reusing it across items keeps phase imports and uploaded PDFs warm.
+    Output is read line by line; only the last OUTPUT_TAIL_LINES of stderr are
+    kept, and everything is echoed live when `echo` is set.
+    """
+    
+    echo = False  # set from --stream-output
+    
+    def __init__(self, key_index, warm_pdfs=()):
+        self.key_index = key_index
+        cmd = [sys.executable, str(REPO_ROOT / "scripts" / "parallel_worker.py"),
+               "--serve", "--key-index", str(key_index)]
+        for pdf in warm_pdfs:
+            cmd.extend(["--warm-pdf", pdf])
+        self.proc = subprocess.Popen(
+            cmd,
+            env=_worker_env(key_index),
+            cwd=str(REPO_ROOT),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+        )
+        self.stderr_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        self._results = queue.Queue()
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        self._stderr_reader = threading.Thread(target=self._read_stderr, daemon=True)
+        self._stderr_reader.start()
+    
+    def _echo(self, line):
+        if self.echo and line.strip():
+            print(f"     [Key{self.key_index+1}] {line.rstrip()}")
+    
+    def _read_stdout(self):
+        for line in self.proc.stdout:
+            if line.startswith(RESULT_PREFIX):
+                self._results.put(json.loads(line[len(RESULT_PREFIX):]))
+            else:
+                self._echo(line)
+        self._results.put(None)  # EOF — the process exited
+    
+    def _read_stderr(self):
+        for line in self.proc.stderr:
+            self.stderr_tail.append(line.rstrip("\n"))
+            self._echo(line)
+    
+    def run(self, item, timeout):
+        """Send one job; returns the worker's result dict, or None if it died.
+
+        Raises queue.Empty when no result arrives within `timeout` seconds.
+        """
+        job = {"phase": item["phase"], "pdf": item["pdf"], "chapter": item["chapter"]}
+        self.stderr_tail.clear()
+        self.proc.stdin.write(json.dumps(job) + "\n")
+        self.proc.stdin.flush()
+        return self._results.get(timeout=timeout)
+    
+    def alive(self):
+        return self.proc.poll() is None
+    
+    def kill(self):
+        self.proc.kill()
+        self.proc.wait()
+    
+    def close(self):
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+
+_idle_workers = defaultdict(list)  # key_index -> [WorkerProcess]
+_all_workers = []
+_workers_lock = threading.Lock()
+
+
+def _checkout_worker(key_index):
+    with _workers_lock:
+        while _idle_workers[key_index]:
+            worker = _idle_workers[key_index].pop()
+            if worker.alive():
+                return worker
+        worker = WorkerProcess(key_index)
+        _all_workers.append(worker)
+        return worker
+
+
+def _checkin_worker(worker):
+    if worker.alive():
+        with _workers_lock:
+            _idle_workers[worker.key_index].append(worker)
+
+
+def prewarm_workers(pdfs_by_key):
+    """Start a worker for each key that has none yet, uploading its PDFs up front.
+
+    The processes import and upload in the background while the caller does
+    other work (e.g. a wave's deterministic items). Keys that already have a
+    live worker keep it; its upload cache is still warm from earlier waves.
+    """
+    with _workers_lock:
+        for key_index, pdfs in pdfs_by_key.items():
+            if any(w.alive() for w in _idle_workers[key_index]):
+                continue
+            worker = WorkerProcess(key_index, pdfs)
+            _all_workers.append(worker)
+            _idle_workers[key_index].append(worker)
+
+
+def shutdown_workers():
+    """Close every worker process started by this orchestrator."""
+    with _workers_lock:
+        workers = list(_all_workers)
+        _all_workers.clear()
+        _idle_workers.clear()
+    for worker in workers:
+        worker.close()
+
+
 def run_worker(item, key_index):
-    """Run a single work item as a subprocess with the correct API key."""
+    """Run a single work item on a persistent worker process for its API key."""
     phase = item["phase"]
-    pdf = item["pdf"]
     chapter = item["chapter"]
     subject = item["subject"]
     
     phase_str = str(phase) if phase != int(phase) else str(int(phase))
     ch_str = f"Ch{chapter}" if chapter else "ALL"
     
-    cmd = [
-        sys.executable, str(REPO_ROOT / "scripts" / "parallel_worker.py"),
-        "--phase", str(phase),
-        "--key-index", str(key_index),
-    ]
-    if pdf:
-        cmd.extend(["--pdf", pdf])
-    if chapter:
-        cmd.extend(["--chapter", str(chapter)])
-    
-    # Set up environment with the correct API key
-    env = os.environ.copy()
-    key_var = f"GEMINI_API_KEY_{key_index + 1}"
-    api_key = _ENV_VALS.get(key_var, _ENV_VALS.get("GEMINI_API_KEY", ""))
-    env["GEMINI_API_KEY"] = api_key
-    
-    # Also pass through Google Cloud creds
-    for k, v in _ENV_VALS.items():
-        if k.startswith("GOOGLE_"):
-            env[k] = v
-    
     start = time.time()
     log_prefix = f"[Key{key_index+1}] P{phase_str} {subject} {ch_str}"
     print(f"  🚀 {log_prefix} — Starting...")
     
+    worker = None
     try:
-        result = subprocess.run(
-            cmd,
-            env=env,
-            cwd=str(REPO_ROOT),
-            capture_output=True,
-            text=True,
-            timeout=900,  # 15 min timeout per work item
-            encoding="utf-8",
-            errors="replace",
-        )
-        
-        elapsed = time.time() - start
-        
-        if result.returncode == 0:
-            print(f"  ✅ {log_prefix} — Done ({int(elapsed)}s)")
-            return {"status": "success", "item": item, "elapsed": elapsed}
-        else:
-            # Extract last few lines of stderr for error context
-            err_lines = (result.stderr or "").strip().split("\n")[-5:]
-            err_summary = "\n".join(err_lines)
-            print(f"  ❌ {log_prefix} — Failed ({int(elapsed)}s)")
-            if err_summary:
-                print(f"     Error: {err_summary[:200]}")
-            return {"status": "failed", "item": item, "elapsed": elapsed,
-                    "error": err_summary}
-    
-    except subprocess.TimeoutExpired:
+        worker = _checkout_worker(key_index)
+        result = worker.run(item, WORKER_TIMEOUT)
+    except queue.Empty:
+        worker.kill()
         elapsed = time.time() - start
         print(f"  ⏰ {log_prefix} — Timeout ({int(elapsed)}s)")
         return {"status": "timeout", "item": item, "elapsed": elapsed}
     except Exception as e:
+        if worker is not None:
+            worker.kill()
         elapsed = time.time() - start
         print(f"  💥 {log_prefix} — Error: {e}")
         return {"status": "error", "item": item, "elapsed": elapsed, "error": str(e)}
+    
+    elapsed = time.time() - start
+    if result is None:
+        code = worker.proc.wait()
+        worker._stderr_reader.join(timeout=5)  # collect the dying process's last lines
+        err_summary = "\n".join(worker.stderr_tail) or f"worker exited with code {code}"
+    elif result["ok"]:
+        _checkin_worker(worker)
+        print(f"  ✅ {log_prefix} — Done ({int(elapsed)}s)")
+        return {"status": "success", "item": item, "elapsed": elapsed}
+    elif result.get("rate_limited"):
+        _checkin_worker(worker)
+        print(f"  🐢 {log_prefix} — Rate limited ({int(elapsed)}s)")
+        return {"status": "rate_limited", "item": item, "elapsed": elapsed,
+                "error": result.get("error", "")}
+    else:
+        _checkin_worker(worker)
+        err_summary = result.get("error", "")
+    
+    print(f"  ❌ {log_prefix} — Failed ({int(elapsed)}s)")
+    if err_summary:
+        print(f"     Error: {err_summary[:200]}")
+    return {"status": "failed", "item": item, "elapsed": elapsed, "error": err_summary}
+
+
+# Per-key start rate for API work items. Each item makes many Gemini calls, so
+# these meter item launches per key rather than raw requests.
+KEY_ITEMS_PER_MINUTE = 6
+KEY_BURST = 2
+
+# AIMD per-key concurrency: start at 1 item in flight, +1 after
+# RAMP_AFTER_SUCCESSES straight successes, halve (and pause) on a 429
+MAX_CONCURRENCY_PER_KEY = 3
+RAMP_AFTER_SUCCESSES = 10
+RATE_LIMIT_COOLDOWN = 60  # seconds
+MAX_RATE_LIMIT_RETRIES = 2  # re-queue a rate-limited item this many times
+
+
+class TokenBucket:
+    """Thread-safe token bucket: bursts up to `capacity`, refills at `refill_rate`/s."""
+    
+    def __init__(self, capacity, refill_rate):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._cond = threading.Condition(threading.Lock())
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+    
+    def available(self):
+        with self._cond:
+            self._refill()
+            return self.tokens
+    
+    def acquire(self, cost=1):
+        """Block until `cost` tokens are available, then take them."""
+        with self._cond:
+            self._refill()
+            while self.tokens < cost:
+                self._cond.wait((cost - self.tokens) / self.refill_rate)
+                self._refill()
+            self.tokens -= cost
+
+
+class AdaptiveLimit:
+    """Per-key in-flight limit with additive increase / multiplicative decrease."""
+    
+    def __init__(self, max_limit, ramp_after, cooldown):
+        self.limit = 1
+        self.max_limit = max_limit
+        self.ramp_after = ramp_after
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._streak = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+    
+    def acquire(self):
+        """Block until this key may start another item."""
+        with self._cond:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    self._cond.wait(pause)
+                elif self.in_flight >= self.limit:
+                    self._cond.wait()
+                else:
+                    self.in_flight += 1
+                    return
+    
+    def release(self, status=None):
+        """Free a slot; `status` of the finished item (None if none ran) drives the limit."""
+        with self._cond:
+            self.in_flight -= 1
+            if status == "rate_limited":
+                self.limit = max(1, self.limit // 2)
+                self._streak = 0
+                self._paused_until = time.monotonic() + self.cooldown
+            elif status == "success":
+                self._streak += 1
+                if self._streak >= self.ramp_after and self.limit < self.max_limit:
+                    self.limit += 1
+                    self._streak = 0
+            elif status is not None:
+                self._streak = 0
+            self._cond.notify_all()
 
 
-def execute_wave(wave_name, items, max_workers=5):
-    """Execute a wave of work items across N workers."""
+class WorkStealingQueues:
+    """One deque per key; a key with an empty deque steals from the busiest one.
+
+    Owners pop from the head; each deque holds its key's preferred subjects,
+    whose PDFs that key's worker already has uploaded. Thieves take the tail
+    half of the victim's deque, leaving the victim's next items in place.
+    """
+    
+    def __init__(self, num_keys):
+        self._queues = [deque() for _ in range(num_keys)]
+        self._locks = [threading.Lock() for _ in range(num_keys)]
+    
+    def push(self, key_idx, item):
+        with self._locks[key_idx]:
+            self._queues[key_idx].append(item)
+    
+    def take(self, key_idx):
+        """Next item for `key_idx`, stealing if needed; None once all deques are empty."""
+        own = self._queues[key_idx]
+        while True:
+            with self._locks[key_idx]:
+                if own:
+                    return own.popleft()
+            
+            victim = max(range(len(self._queues)), key=lambda i: len(self._queues[i]))
+            with self._locks[victim]:
+                q = self._queues[victim]
+                stolen = [q.pop() for _ in range((len(q) + 1) // 2)]
+            if not stolen:
+                if not any(self._queues):
+                    return None
+                continue  # lost a race with another thief; look again
+            
+            stolen.reverse()
+            with self._locks[key_idx]:
+                own.extend(stolen[1:])
+            return stolen[0]
+
+
+# Same-subject upstream phases for each phase. A per-chapter dependency means
+# the same chapter; book-wide phases (glossary) gate every chapter.
+PHASE_DEPENDENCIES = {
+    6:   [2],
+    6.1: [6],
+    7:   [3, 4, 5],
+    8:   [3, 5],
+    8.2: [8],
+    8.1: [7, 8, 8.2],
+}
+BOOK_WIDE_PHASES = {4}
+
+
+def _item_key(item):
+    return (item["phase"], item["subject"], item["chapter"])
+
+
+def build_dependencies(items):
+    """Map each item's key to the keys of the planned items it has to wait for.
+
+    Upstream outputs that already exist aren't in `items`, so they impose no wait.
+    Phase 9 (cross-book bridges) waits for every planned Phase 3 item.
+    """
+    planned = {_item_key(item) for item in items}
+    deps = {}
+    for item in items:
+        phase, subject, chapter = _item_key(item)
+        if phase == 9:
+            upstream = [k for k in planned if k[0] == 3]
+        else:
+            upstream = [(p, subject, None if p in BOOK_WIDE_PHASES else chapter)
+                        for p in PHASE_DEPENDENCIES.get(phase, [])]
+        deps[_item_key(item)] = [k for k in upstream if k in planned]
+    return deps
+
+
+def execute_plan(label, items, max_workers=5, on_result=None):
+    """Execute work items across N workers as soon as their dependencies finish.
+
+    Instead of a barrier between waves, each item is released the moment the
+    planned items it depends on (build_dependencies) have finished, so e.g.
+    Phase 6 for one book overlaps Phase 2 still running for another. As with
+    the old wave barrier, a failed dependency doesn't block its dependents —
+    the phases skip chapters whose inputs are missing. `on_result` is called
+    with each result as it arrives.
+    """
     if not items:
-        print(f"\n✅ {wave_name}: Nothing to do — all complete!")
+        print(f"\n✅ {label}: Nothing to do — all complete!")
         return []
     
     # Split items into API-needing and non-API items
@@ -386,101 +804,130 @@ def execute_wave(wave_name, items, max_workers=5):
     non_api_items = [i for i in items if not i.get("api_needed", True)]
     
     print(f"\n{'='*70}")
-    print(f"🌊 {wave_name.upper()}: {len(items)} work items "
+    print(f"🌊 {label.upper()}: {len(items)} work items "
           f"({len(api_items)} API, {len(non_api_items)} deterministic)")
     print(f"{'='*70}")
     
     results = []
     
-    # Run deterministic items first (no API key needed, fast)
-    if non_api_items:
-        print(f"\n  📐 Running {len(non_api_items)} deterministic items (Phase 7, 8.1)...")
-        with ThreadPoolExecutor(max_workers=min(5, len(non_api_items))) as executor:
-            futures = {
-                executor.submit(run_worker, item, 0): item
-                for item in non_api_items
-            }
-            for future in as_completed(futures):
-                results.append(future.result())
-    
-    # Run API items with round-robin key assignment
+    # Group items by subject so a book's chapters prefer the same key (warm PDF upload)
+    subjects = sorted({item["subject"] for item in api_items})
+    preferred_key = {subj: i % max_workers for i, subj in enumerate(subjects)}
     if api_items:
-        print(f"\n  🔑 Running {len(api_items)} API items across {max_workers} keys...")
-        
-        # Group items by subject for better PDF caching (same PDF stays on same worker)
-        subject_groups = defaultdict(list)
+        pdfs_by_key = defaultdict(set)
         for item in api_items:
-            subject_groups[item["subject"]].append(item)
-        
-        # Assign subjects to workers round-robin
-        subjects = list(subject_groups.keys())
-        worker_queues = [[] for _ in range(max_workers)]
-        for i, subj in enumerate(subjects):
-            worker_idx = i % max_workers
-            worker_queues[worker_idx].extend(subject_groups[subj])
-        
-        # Flatten back into ordered work items with key assignments
-        assigned_items = []
-        for key_idx, queue in enumerate(worker_queues):
-            for item in queue:
-                assigned_items.append((item, key_idx))
-        
-        # Process with thread pool — each thread runs a subprocess
-        # Limit concurrency to avoid hitting per-key TPM limits
-        # With 5 keys, run 5 items concurrently (1 per key at a time)
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Track which keys are busy to avoid concurrent calls on same key
-            futures = {}
-            pending = list(assigned_items)
-            active_keys = set()
+            if item["pdf"]:
+                pdfs_by_key[preferred_key[item["subject"]]].add(item["pdf"])
+        prewarm_workers({k: sorted(pdfs_by_key[k]) for k in range(max_workers)})
+    
+    deps = build_dependencies(items)
+    by_key = {_item_key(item): item for item in items}
+    waiting = {key: len(upstream) for key, upstream in deps.items()}
+    dependents = defaultdict(list)
+    for key, upstream in deps.items():
+        for dep in upstream:
+            dependents[dep].append(key)
+    
+    buckets = [TokenBucket(KEY_BURST, KEY_ITEMS_PER_MINUTE / 60) for _ in range(max_workers)]
+    limits = [AdaptiveLimit(MAX_CONCURRENCY_PER_KEY, RAMP_AFTER_SUCCESSES, RATE_LIMIT_COOLDOWN)
+              for _ in range(max_workers)]
+    rate_limit_retries = defaultdict(int)
+    queues = WorkStealingQueues(max_workers)
+    deterministic = deque()
+    cv = threading.Condition()
+    stop = threading.Event()  # set on Ctrl+C so drivers stop pulling new items
+    
+    def release(item):
+        if item.get("api_needed", True):
+            queues.push(preferred_key[item["subject"]], item)
+        else:
+            deterministic.append(item)
+    
+    def next_item(take):
+        """Block until `take()` yields an item; None once every item has finished
+        or a stop was requested."""
+        with cv:
+            while True:
+                if stop.is_set():
+                    return None
+                item = take()
+                if item is not None:
+                    return item
+                if len(results) == len(items):
+                    return None
+                cv.wait()
+    
+    def complete(item, result):
+        if on_result is not None:
+            on_result(result)
+        with cv:
+            results.append(result)
+            for key in dependents[_item_key(item)]:
+                waiting[key] -= 1
+                if waiting[key] == 0:
+                    release(by_key[key])
+            cv.notify_all()
+    
+    def api_driver(key_idx):
+        # MAX_CONCURRENCY_PER_KEY drivers per key; limits[key_idx] decides how many run
+        while True:
+            limits[key_idx].acquire()
+            item = next_item(lambda: queues.take(key_idx))
+            if item is None:
+                limits[key_idx].release()
+                return
+            buckets[key_idx].acquire()
+            if stop.is_set():  # Ctrl+C while waiting for a token
+                limits[key_idx].release()
+                return
+            result = run_worker(item, key_idx)
+            limits[key_idx].release(result["status"])
             
-            while pending or futures:
-                # Submit new items if keys are available
-                while pending:
-                    item, key_idx = pending[0]
-                    if key_idx not in active_keys:
-                        active_keys.add(key_idx)
-                        future = executor.submit(run_worker, item, key_idx)
-                        futures[future] = (item, key_idx)
-                        pending.pop(0)
-                    else:
-                        # This key is busy, try next item
-                        found = False
-                        for i, (it, ki) in enumerate(pending):
-                            if ki not in active_keys:
-                                active_keys.add(ki)
-                                future = executor.submit(run_worker, it, ki)
-                                futures[future] = (it, ki)
-                                pending.pop(i)
-                                found = True
-                                break
-                        if not found:
-                            break  # All available keys are busy, wait
-                
-                # Wait for at least one to complete
-                if futures:
-                    done_futures = []
-                    for future in list(futures.keys()):
-                        if future.done():
-                            done_futures.append(future)
-                    
-                    if not done_futures:
-                        # None done yet, wait a bit
-                        time.sleep(0.5)
-                        continue
-                    
-                    for future in done_futures:
-                        item, key_idx = futures.pop(future)
-                        active_keys.discard(key_idx)
-                        result = future.result()
-                        results.append(result)
+            key = _item_key(item)
+            if result["status"] == "rate_limited" and rate_limit_retries[key] < MAX_RATE_LIMIT_RETRIES:
+                rate_limit_retries[key] += 1
+                with cv:
+                    queues.push(key_idx, item)  # back of the line, after the cool-down
+                    cv.notify_all()
+                continue
+            complete(item, result)
+    
+    def deterministic_driver():
+        # No API key needed; these run on key 0's environment
+        while True:
+            item = next_item(lambda: deterministic.popleft() if deterministic else None)
+            if item is None:
+                return
+            complete(item, run_worker(item, 0))
+    
+    with cv:
+        for key, count in waiting.items():
+            if count == 0:
+                release(by_key[key])
+    
+    print(f"\n  🔑 Running {len(api_items)} API items across {max_workers} keys, "
+          f"{len(non_api_items)} deterministic items (Phase 7, 8.1) alongside...")
+    num_det = min(5, len(non_api_items))
+    with ThreadPoolExecutor(max_workers=max_workers * MAX_CONCURRENCY_PER_KEY + num_det) as executor:
+        futures = [executor.submit(api_driver, key_idx)
+                   for key_idx in range(max_workers) for _ in range(MAX_CONCURRENCY_PER_KEY)]
+        futures += [executor.submit(deterministic_driver) for _ in range(num_det)]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except KeyboardInterrupt:
+            # Let in-flight items return, but don't start (or respawn workers for) new ones
+            stop.set()
+            with cv:
+                cv.notify_all()
+            raise
     
     # Summary
     successes = sum(1 for r in results if r["status"] == "success")
     failures = sum(1 for r in results if r["status"] != "success")
     total_time = sum(r.get("elapsed", 0) for r in results)
     
-    print(f"\n  📊 {wave_name} Results: {successes}✅ {failures}❌ | Total worker-time: {int(total_time)}s")
+    print(f"\n  📊 {label} Results: {successes}✅ {failures}❌ | Total worker-time: {int(total_time)}s")
     
     if failures > 0:
         print(f"\n  ⚠️  Failed items:")
@@ -492,34 +939,62 @@ def execute_wave(wave_name, items, max_workers=5):
     return results
 
 
-def save_run_log(all_results, start_time):
-    """Save a comprehensive run log."""
-    log_dir = REPO_ROOT / "logs"
-    log_dir.mkdir(exist_ok=True)
+def _dumps(obj, indent=False):
+    """JSON bytes via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def _result_record(r):
+    return {
+        "phase": r["item"]["phase"],
+        "subject": r["item"]["subject"],
+        "chapter": r["item"].get("chapter"),
+        "status": r["status"],
+        "elapsed": round(r.get("elapsed", 0), 1),
+        "error": r.get("error", ""),
+    }
+
+
+class RunLog:
+    """Append-only JSONL of item results, flushed per line so a crash keeps what finished."""
+    
+    def __init__(self, start_time):
+        log_dir = REPO_ROOT / "logs"
+        log_dir.mkdir(exist_ok=True)
+        self.path = log_dir / f"parallel_run_{start_time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+        self._file = open(self.path, "ab")
+        self._lock = threading.Lock()
+    
+    def append(self, result):
+        line = _dumps(_result_record(result)) + b"\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+    
+    def close(self):
+        self._file.close()
+
+
+def save_run_log(run_log, start_time):
+    """Save a comprehensive run log (pretty JSON built from the streamed JSONL)."""
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(run_log.path, "rb") as f:
+        records = [loads(line) for line in f if line.strip()]
     
     log = {
         "started": start_time.isoformat(),
         "finished": datetime.now().isoformat(),
         "elapsed_seconds": (datetime.now() - start_time).total_seconds(),
-        "total_items": len(all_results),
-        "successes": sum(1 for r in all_results if r["status"] == "success"),
-        "failures": sum(1 for r in all_results if r["status"] != "success"),
-        "results": [
-            {
-                "phase": r["item"]["phase"],
-                "subject": r["item"]["subject"],
-                "chapter": r["item"].get("chapter"),
-                "status": r["status"],
-                "elapsed": round(r.get("elapsed", 0), 1),
-                "error": r.get("error", ""),
-            }
-            for r in all_results
-        ],
+        "total_items": len(records),
+        "successes": sum(1 for r in records if r["status"] == "success"),
+        "failures": sum(1 for r in records if r["status"] != "success"),
+        "results": records,
     }
     
-    path = log_dir / f"parallel_run_{start_time.strftime('%Y%m%d_%H%M%S')}.json"
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(log, f, indent=2)
+    path = run_log.path.with_suffix(".json")
+    path.write_bytes(_dumps(log, indent=True))
     print(f"\n  💾 Run log saved: {path.relative_to(REPO_ROOT)}")
 
 
@@ -530,7 +1005,9 @@ def main():
     parser.add_argument("--status", action="store_true", help="Show completion status only")
     parser.add_argument("--workers", type=int, default=NUM_KEYS, help=f"Number of parallel workers (default: {NUM_KEYS})")
     parser.add_argument("--retry-failed", action="store_true", help="Retry previously failed items")
+    parser.add_argument("--stream-output", action="store_true", help="Echo worker output live")
     args = parser.parse_args()
+    WorkerProcess.echo = args.stream_output
     
     print(f"\n{'='*70}")
     print(f"🧬 MCAT MASTERY — PARALLEL PIPELINE ORCHESTRATOR")
@@ -572,7 +1049,7 @@ def main():
         print("\n🎉 All phases complete! Nothing to do.")
         return
     
-    # Execute waves in order
+    # Execute all selected waves as one dependency graph
     start_time = datetime.now()
     all_results = []
     
@@ -581,23 +1058,20 @@ def main():
     if args.wave:
         wave_order = [f"wave{args.wave}"]
     
-    for wave_name in wave_order:
-        items = waves.get(wave_name, [])
-        if not items:
-            continue
-        
-        results = execute_wave(wave_name, items, max_workers=args.workers)
-        all_results.extend(results)
-        
-        # Check if wave had critical failures that block next wave
-        failures = [r for r in results if r["status"] != "success"]
-        if failures:
-            print(f"\n  ⚠️  {len(failures)} failures in {wave_name}.")
-            if wave_name in ["wave1", "wave2"]:
-                print(f"  Continuing to next wave — later phases may skip affected chapters.")
+    PID_FILE.parent.mkdir(exist_ok=True)
+    PID_FILE.write_text(str(os.getpid()), encoding="utf-8")
+    run_log = RunLog(start_time)
+    try:
+        items = [item for wave_name in wave_order for item in waves.get(wave_name, [])]
+        all_results = execute_plan("+".join(wave_order), items, max_workers=args.workers,
+                                   on_result=run_log.append)
+    finally:
+        run_log.close()
+        shutdown_workers()
+        PID_FILE.unlink(missing_ok=True)
     
     # Save log
-    save_run_log(all_results, start_time)
+    save_run_log(run_log, start_time)
     
     # Final summary
     elapsed = (datetime.now() - start_time).total_seconds()
@@ -4,10 +4,12 @@ Called by parallel_pipeline.py with a specific API key set in the environment.
 
 Usage (called by orchestrator, not directly):
     python scripts/parallel_worker.py --phase 3 --pdf "MCAT Biology Review.pdf" --chapter 2 --key-index 0
+    python scripts/parallel_worker.py --serve --key-index 0   # persistent: jobs on stdin
 """
 
 import sys
 import os
+import json
 import argparse
 import time
 import traceback
@@ -22,6 +24,11 @@ sys.path.insert(0, str(REPO_ROOT / "scripts"))
 if sys.platform == "win32":
     sys.stdout.reconfigure(encoding="utf-8", errors="replace")
     sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+    sys.stdin.reconfigure(encoding="utf-8", errors="replace")
+
+# Marks the line carrying a job's outcome in --serve mode; everything else on
+# stdout is ordinary phase output.
+RESULT_PREFIX = "@@WORKER_RESULT "
 
 
 def run_phase(phase: float, pdf_filename: str = None, chapter_num: int = None):
@@ -80,14 +87,97 @@ def run_phase(phase: float, pdf_filename: str = None, chapter_num: int = None):
         raise ValueError(f"Unknown phase: {phase}")
 
 
+def prewarm(pdf_filenames):
+    """Import the Gemini SDK and upload `pdf_filenames` before the first job.
+
+    Uploads land in GeminiClient's process-wide cache under the same path the
+    phases use, so their own upload_pdf() calls become cache hits. Best effort:
+    any failure is left for the real job to hit and report.
+    """
+    try:
+        from config import PDFS_DIR
+        from utils.gemini_client import GeminiClient
+        if not pdf_filenames:
+            return
+        client = GeminiClient(enable_caching=False)
+        for pdf_filename in pdf_filenames:
+            pdf_path = PDFS_DIR / pdf_filename
+            if pdf_path.exists():
+                client.upload_pdf(pdf_path)
+    except Exception:
+        traceback.print_exc()
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """True if `exc` (or anything it was raised from) is a Gemini 429 / quota error."""
+    try:
+        from google.api_core.exceptions import ResourceExhausted
+    except ImportError:
+        ResourceExhausted = ()
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, ResourceExhausted) or "429" in str(exc) or "RESOURCE_EXHAUSTED" in str(exc):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def serve(key_index: int, warm_pdfs=()):
+    """Run jobs read from stdin (one JSON object per line) until EOF.
+
+    Keeps phase modules, the Gemini client and its uploaded-PDF cache warm
+    across work items that share this process's API key. After each job a
+    RESULT_PREFIX line reports {"ok", "error", "elapsed"} to the orchestrator,
+    plus "rate_limited" when the failure was a quota (429) error.
+    """
+    # Phases call client.cleanup() when they finish, which would delete the
+    # uploaded PDFs the next chapter of the same book needs. Uploads are left
+    # in place (recorded in GEMINI_FILES_MANIFEST) for later runs to reuse;
+    # the file API expires them on its own.
+    try:
+        from utils.gemini_client import GeminiClient
+        GeminiClient.keep_uploads = True
+    except ImportError:
+        pass
+    
+    prewarm(warm_pdfs)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        start = time.time()
+        result = {"ok": True, "error": ""}
+        try:
+            run_phase(job["phase"], job.get("pdf"), job.get("chapter"))
+        except SystemExit as e:
+            # Phase scripts occasionally sys.exit(); only a non-zero code is a failure
+            if e.code not in (None, 0):
+                result = {"ok": False, "error": f"exit code {e.code}"}
+        except Exception as e:
+            tb = traceback.format_exc()
+            sys.stderr.write(tb)
+            result = {"ok": False, "error": "\n".join(tb.strip().split("\n")[-5:]),
+                      "rate_limited": is_rate_limited(e)}
+        result["elapsed"] = time.time() - start
+        sys.stdout.write(f"\n{RESULT_PREFIX}{json.dumps(result)}\n")
+        sys.stdout.flush()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Pipeline Worker")
-    parser.add_argument("--phase", type=float, required=True)
+    parser.add_argument("--phase", type=float, default=None)
+    parser.add_argument("--serve", action="store_true",
+                        help="Stay alive and run JSON jobs from stdin")
+    parser.add_argument("--warm-pdf", action="append", default=[],
+                        help="With --serve: upload this PDF before the first job (repeatable)")
     parser.add_argument("--pdf", type=str, default=None)
     parser.add_argument("--chapter", type=int, default=None)
     parser.add_argument("--key-index", type=int, default=0,
                         help="Which API key to use (0-4)")
     args = parser.parse_args()
+    if args.phase is None and not args.serve:
+        parser.error("--phase is required unless --serve is given")
     
     # The orchestrator already sets GEMINI_API_KEY in the subprocess environment.
     # Just verify it's there. No need to load .env again.
@@ -104,6 +194,10 @@ def main():
         except ImportError:
             pass
     
+    if args.serve:
+        serve(args.key_index, args.warm_pdf)
+        return
+    
     phase_str = str(args.phase) if args.phase != int(args.phase) else str(int(args.phase))
     pdf_short = Path(args.pdf).stem if args.pdf else "ALL"
     ch_str = f"Ch{args.chapter}" if args.chapter else "ALL"
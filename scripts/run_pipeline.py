@@ -52,7 +52,7 @@ def _sigint_handler(signum, frame):
     # Only trigger graceful exit on first interrupt
     # If the process just started, ignore one spurious SIGINT (Windows noise)
     if INTERRUPT_COUNT == 1:
-        config.INTERRUPT_REQUESTED = True
+        config.INTERRUPT_REQUESTED.set()
         print("\n⚠️ Interrupt requested — will stop after the current Gemini call. Press Ctrl+C again to force immediate exit.")
     else:
         raise KeyboardInterrupt
@@ -70,7 +70,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 def main():
     # Initialize interrupt state for this run
-    config.INTERRUPT_REQUESTED = False
+    config.INTERRUPT_REQUESTED.clear()
     
     parser = argparse.ArgumentParser(description="MCAT Content Pipeline Orchestrator")
     parser.add_argument("pdf", nargs="?", help="PDF filename (e.g., biology.pdf) or omit for all")
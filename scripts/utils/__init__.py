@@ -1,4 +1,24 @@
 # Pipeline Utilities
-from .gemini_client import GeminiClient
-from .image_matcher import match_images_to_figures
-from .schema_validator import validate_extraction, validate_restructured
+# Exported lazily (PEP 562): importing one submodule, e.g. utils.conversation_manager,
+# shouldn't pull in google.generativeai through gemini_client
+from importlib import import_module
+
+_EXPORTS = {
+    "GeminiClient": "gemini_client",
+    "match_images_to_figures": "image_matcher",
+    "validate_extraction": "schema_validator",
+    "validate_restructured": "schema_validator",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
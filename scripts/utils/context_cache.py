@@ -36,6 +36,11 @@ from typing import Any, Dict, List, Optional
 
 import google.generativeai as genai
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 CACHE_DIR = PROJECT_ROOT / "logs" / "context_cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
@@ -60,6 +65,8 @@ class ContextCache:
         """Load cache index from disk."""
         if CACHE_INDEX_FILE.exists():
             try:
+                if orjson is not None:
+                    return orjson.loads(CACHE_INDEX_FILE.read_bytes())
                 with open(CACHE_INDEX_FILE, 'r', encoding='utf-8') as f:
                     return json.load(f)
             except Exception:
@@ -67,10 +74,13 @@ class ContextCache:
         return {"caches": {}, "stats": {"total_created": 0, "total_hits": 0, "total_saved_tokens": 0}}
     
     def _save_index(self) -> None:
-        """Save cache index to disk."""
+        """Save cache index to disk (compact: it is read on every session start)."""
         try:
+            if orjson is not None:
+                CACHE_INDEX_FILE.write_bytes(orjson.dumps(self.cache_index))
+                return
             with open(CACHE_INDEX_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.cache_index, f, indent=2)
+                json.dump(self.cache_index, f, separators=(",", ":"))
         except Exception as e:
             print(f"⚠️  Failed to save cache index: {e}")
     
@@ -322,6 +332,29 @@ class ContextCache:
         
         return sorted(active_caches, key=lambda x: x["expires_in_minutes"], reverse=True)
     
+    def get_resume_context(self, session_id: str, history_fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Session-resume context built earlier for this exact history, if any.
+        
+        Args:
+            session_id: Conversation session ID
+            history_fingerprint: ConversationManager.history_fingerprint() at build time
+        """
+        entry = self.cache_index.get("resume_contexts", {}).get(session_id)
+        if entry and entry["fingerprint"] == history_fingerprint:
+            return entry["context"]
+        return None
+    
+    def set_resume_context(self, session_id: str, history_fingerprint: str,
+                           context: Dict[str, Any]) -> None:
+        """Remember the resume context for a session (one entry per session, latest wins)."""
+        self.cache_index.setdefault("resume_contexts", {})[session_id] = {
+            "fingerprint": history_fingerprint,
+            "context": context,
+            "created_at": datetime.now().isoformat()
+        }
+        self._save_index()
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get cache usage statistics."""
         stats = self.cache_index["stats"].copy()
@@ -4,7 +4,7 @@ Conversation Manager
 Manages conversation persistence across sessions to save on API usage and context windows.
 
 Features:
-- Save/load conversation history
+- Save/load conversation history (SQLite, one row per message; metadata as msgpack when installed)
 - Automatic context summarization when conversations get too long
 - Session restoration with context reconstruction
 - Cross-session memory for AI agents
@@ -22,15 +22,123 @@ Usage:
     history = manager.get_history()
 """
 
+import re
 import json
+import sqlite3
 import hashlib
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import Callable, List, Dict, Optional, Any
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 CONVERSATIONS_DIR = PROJECT_ROOT / "logs" / "conversations"
 CONVERSATIONS_DIR.mkdir(parents=True, exist_ok=True)
+DB_PATH = CONVERSATIONS_DIR / "conversations.db"
+
+# One row per message: appending is a single INSERT instead of rewriting the session
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq        INTEGER NOT NULL,
+    role       TEXT NOT NULL,
+    content    TEXT NOT NULL,
+    ts         TEXT NOT NULL,
+    meta       BLOB,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    metadata   BLOB NOT NULL
+);
+"""
+
+
+def _pack(obj: Dict[str, Any]):
+    """Encode a metadata dict for the store: msgpack bytes when installed, else JSON text."""
+    if msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _unpack(blob) -> Dict[str, Any]:
+    """Decode a value written by _pack (either encoding; rows from before msgpack are JSON)."""
+    if not blob:
+        return {}
+    if isinstance(blob, bytes):
+        if msgpack is None:
+            raise RuntimeError("conversation store has msgpack data; pip install msgpack")
+        return msgpack.unpackb(blob, raw=False)
+    return json.loads(blob)
+
+
+def _connect(db_path: Path = DB_PATH) -> sqlite3.Connection:
+    """Open the conversation store (WAL: appends don't block readers)."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _load_session_meta(file_path: Path) -> Optional[Dict[str, Any]]:
+    """Listing entry for a legacy session_*.json file (None if unreadable)."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception:
+        return None
+    return {
+        "session_id": data.get("session_id"),
+        "file": file_path.name,
+        "message_count": len(data.get("messages", [])),
+        "last_updated": data.get("metadata", {}).get("last_updated"),
+    }
+
+
+# Pipeline progress lines (fixing, regenerating, saved, verifying, stats) echoed into
+# a conversation: useful live, pure noise in history
+STATUS_LINE_RE = re.compile(r"^\s*(🔧|🔄|💾|🔍|📊)")
+
+
+def is_status_message(msg: Dict[str, Any]) -> bool:
+    """True for assistant messages that are just a pipeline status print."""
+    return msg.get("role") == "assistant" and bool(STATUS_LINE_RE.match(msg.get("content", "")))
+
+
+def compact_history(messages: List[Dict[str, Any]],
+                    drop_predicate: Optional[Callable[[Dict[str, Any]], bool]] = is_status_message
+                    ) -> List[Dict[str, Any]]:
+    """
+    Shrink history by deleting whole messages verbatim — no LLM call, nothing rewritten.
+    
+    Drops messages matching drop_predicate, and earlier copies of any message whose
+    role + content repeats later (e.g. the same file read or tool output twice),
+    keeping the most recent one.
+    
+    Returns:
+        The surviving messages, in their original order
+    """
+    seen = set()
+    kept = []
+    for msg in reversed(messages):
+        if drop_predicate and drop_predicate(msg):
+            continue
+        key = hashlib.blake2b(f"{msg['role']}\0{msg['content']}".encode("utf-8"),
+                              digest_size=16).digest()
+        if key in seen:
+            continue
+        seen.add(key)
+        kept.append(msg)
+    kept.reverse()
+    return kept
 
 
 class ConversationManager:
@@ -54,8 +162,17 @@ class ConversationManager:
             "last_updated": datetime.now().isoformat(),
             "message_count": 0,
             "summarized": False,
+            # Rolling summary of messages[:summarized_upto] (ConversationSummarizer.incremental_summarize)
+            "cached_summary": None,
+            "summarized_upto": 0,
         }
+        self._db = _connect()
         self._load()
+        # Prefix sums of message lengths: _cum_chars[k] = chars in the first k messages
+        self._cum_chars = list(accumulate((len(m["content"]) for m in self.messages), initial=0))
+        # Bumped on every change to self.messages; _memo entries are (version, value)
+        self._version = 0
+        self._memo: Dict[tuple, tuple] = {}
     
     def _generate_session_id(self) -> str:
         """Generate a unique session ID based on timestamp."""
@@ -63,11 +180,32 @@ class ConversationManager:
         return hashlib.md5(timestamp.encode()).hexdigest()[:16]
     
     def _get_file_path(self) -> Path:
-        """Get the file path for this session's data."""
+        """Get the legacy JSON file path for this session (import/export only)."""
         return CONVERSATIONS_DIR / f"session_{self.session_id}.json"
     
     def _load(self) -> None:
-        """Load conversation history from disk if it exists."""
+        """Load conversation history from the store, importing a legacy JSON file once."""
+        rows = self._db.execute(
+            "SELECT role, content, ts, meta FROM messages WHERE session_id = ? ORDER BY seq",
+            (self.session_id,)
+        ).fetchall()
+        row = self._db.execute(
+            "SELECT metadata FROM sessions WHERE session_id = ?", (self.session_id,)
+        ).fetchone()
+        # A sessions row means the store owns this session (imported, saved or
+        # cleared), so a leftover legacy file must not be imported again
+        if rows or row:
+            self.messages = [
+                {"role": role, "content": content, "timestamp": ts,
+                 "metadata": _unpack(meta)}
+                for role, content, ts, meta in rows
+            ]
+            if row:
+                self.metadata = _unpack(row[0])
+            if self.messages:
+                print(f"📂 Loaded conversation: {len(self.messages)} messages")
+            return
+        
         file_path = self._get_file_path()
         if file_path.exists():
             try:
@@ -75,28 +213,55 @@ class ConversationManager:
                     data = json.load(f)
                     self.messages = data.get("messages", [])
                     self.metadata = data.get("metadata", self.metadata)
-                    print(f"📂 Loaded conversation: {len(self.messages)} messages")
+                with self._db:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?)",
+                        [self._row(seq, m) for seq, m in enumerate(self.messages)]
+                    )
+                    self._upsert_session()
+                print(f"📂 Loaded conversation: {len(self.messages)} messages (imported from {file_path.name})")
             except Exception as e:
                 print(f"⚠️  Failed to load conversation: {e}")
     
+    def _row(self, seq: int, message: Dict[str, Any]) -> tuple:
+        """messages-table row for a message dict."""
+        return (self.session_id, seq, message["role"], message["content"],
+                message.get("timestamp", ""),
+                _pack(message["metadata"]) if message.get("metadata") else None)
+    
+    def _upsert_session(self) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO sessions VALUES (?, ?)",
+            (self.session_id, _pack(self.metadata))
+        )
+    
     def save(self) -> None:
-        """Save conversation history to disk."""
+        """Save session metadata (messages are persisted as they are added)."""
         self.metadata["last_updated"] = datetime.now().isoformat()
         self.metadata["message_count"] = len(self.messages)
         
+        try:
+            with self._db:
+                self._upsert_session()
+            print(f"💾 Saved conversation: {len(self.messages)} messages -> {DB_PATH.name}")
+        except Exception as e:
+            print(f"⚠️  Failed to save conversation: {e}")
+    
+    def dump(self, file_path: Optional[Path] = None) -> Path:
+        """Export this session in the legacy JSON format (for sharing/inspection)."""
+        file_path = file_path or self._get_file_path()
         data = {
             "session_id": self.session_id,
             "messages": self.messages,
             "metadata": self.metadata
         }
-        
-        file_path = self._get_file_path()
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"💾 Saved conversation: {len(self.messages)} messages -> {file_path.name}")
-        except Exception as e:
-            print(f"⚠️  Failed to save conversation: {e}")
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return file_path
+    
+    def close(self) -> None:
+        """Close the store connection."""
+        self._db.close()
     
     def add_message(self, role: str, content: str, metadata: Optional[Dict] = None) -> None:
         """
@@ -114,15 +279,55 @@ class ConversationManager:
             "metadata": metadata or {}
         }
         self.messages.append(message)
+        self._cum_chars.append(self._cum_chars[-1] + len(content))
+        self._version += 1
+        
+        # Persist just this message (O(1) append)
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?)",
+                             self._row(len(self.messages) - 1, message))
+            if len(self.messages) == 1:
+                self._upsert_session()
         
-        # Auto-save after each message
-        if len(self.messages) % 10 == 0:  # Save every 10 messages
+        # Refresh session metadata periodically
+        if len(self.messages) % 10 == 0:
             self.save()
         
         # Check if we need to summarize
         if len(self.messages) > self.max_messages and not self.metadata.get("summarized"):
             self._trigger_summarization_warning()
     
+    def add_messages(self, messages: List[tuple]) -> None:
+        """
+        Add several messages and refresh session metadata in a single transaction.
+        
+        Args:
+            messages: (role, content, metadata) tuples; metadata may be None
+        """
+        now = datetime.now().isoformat()
+        start = len(self.messages)
+        for role, content, metadata in messages:
+            self.messages.append({
+                "role": role,
+                "content": content,
+                "timestamp": now,
+                "metadata": metadata or {}
+            })
+            self._cum_chars.append(self._cum_chars[-1] + len(content))
+        self._version += 1
+        self.metadata["last_updated"] = now
+        self.metadata["message_count"] = len(self.messages)
+        
+        # One commit for the whole batch instead of one per message plus one for save()
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?)",
+                                 [self._row(seq, self.messages[seq])
+                                  for seq in range(start, len(self.messages))])
+            self._upsert_session()
+        
+        if len(self.messages) > self.max_messages and not self.metadata.get("summarized"):
+            self._trigger_summarization_warning()
+    
     def _trigger_summarization_warning(self) -> None:
         """Warn that conversation should be summarized."""
         print(f"\n⚠️  Conversation has {len(self.messages)} messages.")
@@ -142,6 +347,26 @@ class ConversationManager:
             return self.messages[-last_n:]
         return self.messages
     
+    @property
+    def total_tokens(self) -> int:
+        """Estimated tokens in the whole history (1 token ≈ 4 chars), kept up to date as messages are added."""
+        return self._cum_chars[-1] // 4
+    
+    def history_fingerprint(self) -> str:
+        """Cheap identity of the current history: changes whenever a message is added or cleared."""
+        last = self.messages[-1]["timestamp"] if self.messages else ""
+        key = f"{len(self.messages)}\0{last}\0{self._cum_chars[-1]}"
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _memoized(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        """compute() cached until the message list next changes."""
+        hit = self._memo.get(key)
+        if hit is not None and hit[0] == self._version:
+            return hit[1]
+        value = compute()
+        self._memo[key] = (self._version, value)
+        return value
+    
     def get_formatted_history(self, last_n: Optional[int] = None, include_metadata: bool = False) -> str:
         """
         Get conversation history formatted as a string for context injection.
@@ -153,6 +378,10 @@ class ConversationManager:
         Returns:
             Formatted conversation string
         """
+        return self._memoized(("formatted", last_n, include_metadata),
+                              lambda: self._format_history(last_n, include_metadata))
+    
+    def _format_history(self, last_n: Optional[int], include_metadata: bool) -> str:
         messages = self.get_history(last_n)
         formatted = []
         
@@ -164,13 +393,19 @@ class ConversationManager:
         
         return "\n\n".join(formatted)
     
-    def summarize_and_compress(self, keep_recent: int = 20) -> Dict[str, Any]:
+    def summarize_and_compress(self, keep_recent: int = 20,
+                               max_tokens_estimate: Optional[int] = None) -> Dict[str, Any]:
         """
         Summarize older messages and keep only recent ones + summary.
         This should be called with a Gemini client to actually generate the summary.
         
+        Older messages are compacted first (compact_history). If that alone brings the
+        whole history under max_tokens_estimate, no summary is requested at all.
+        
         Args:
             keep_recent: Number of recent messages to keep in full
+            max_tokens_estimate: Token budget (rough: 1 token ≈ 4 chars) that lets
+                compaction skip summarization
             
         Returns:
             Summary data for use with Gemini
@@ -178,9 +413,27 @@ class ConversationManager:
         if len(self.messages) <= keep_recent:
             return {"summary": None, "kept_messages": self.messages}
         
-        # Split into old and recent
-        old_messages = self.messages[:-keep_recent]
+        # Split into old and recent; compact the old part verbatim before summarizing
+        old_messages = compact_history(self.messages[:-keep_recent])
         recent_messages = self.messages[-keep_recent:]
+        compacted_count = len(self.messages) - keep_recent - len(old_messages)
+        
+        if max_tokens_estimate is not None:
+            total_chars = sum(len(m["content"]) for m in old_messages + recent_messages)
+            if total_chars // 4 <= max_tokens_estimate:
+                return {
+                    "summary": None,
+                    "kept_messages": old_messages + recent_messages,
+                    "compression_info": {
+                        "original_count": len(self.messages),
+                        "compressed_to": len(old_messages) + len(recent_messages),
+                        "summarized_count": 0,
+                        "compacted_count": compacted_count,
+                    }
+                }
+        
+        if not old_messages:
+            return {"summary": None, "kept_messages": recent_messages}
         
         # Create a summary request (to be used with GeminiClient)
         summary_request = {
@@ -198,7 +451,8 @@ class ConversationManager:
             "compression_info": {
                 "original_count": len(self.messages),
                 "compressed_to": keep_recent,
-                "summarized_count": len(old_messages)
+                "summarized_count": len(old_messages),
+                "compacted_count": compacted_count,
             }
         }
     
@@ -215,16 +469,12 @@ class ConversationManager:
         # Rough estimate: 1 token ≈ 4 characters
         max_chars = max_tokens_estimate * 4
         
-        # Start with most recent messages
-        selected_messages = []
-        total_chars = 0
-        
-        for msg in reversed(self.messages):
-            msg_chars = len(msg["content"])
-            if total_chars + msg_chars > max_chars:
-                break
-            selected_messages.insert(0, msg)
-            total_chars += msg_chars
+        # Longest suffix of recent messages that fits: the first start index whose
+        # remaining total is within budget (binary search over the prefix sums)
+        total = self._cum_chars[-1]
+        start = bisect_left(self._cum_chars, total - max_chars)
+        selected_messages = self.messages[start:]
+        total_chars = total - self._cum_chars[start]
         
         return {
             "messages": selected_messages,
@@ -236,7 +486,13 @@ class ConversationManager:
     def clear(self) -> None:
         """Clear all messages and reset conversation."""
         self.messages = []
+        self._cum_chars = [0]
+        self._version += 1
+        with self._db:
+            self._db.execute("DELETE FROM messages WHERE session_id = ?", (self.session_id,))
         self.metadata["message_count"] = 0
+        self.metadata["cached_summary"] = None
+        self.metadata["summarized_upto"] = 0
         self.metadata["last_updated"] = datetime.now().isoformat()
         self.save()
         print("🗑️  Conversation cleared")
@@ -247,9 +503,9 @@ class ConversationManager:
             "session_id": self.session_id,
             "metadata": self.metadata,
             "message_count": len(self.messages),
-            "roles_breakdown": self._count_by_role(),
+            "roles_breakdown": dict(self._memoized(("roles",), self._count_by_role)),
             "time_span": self._get_time_span(),
-            "estimated_total_tokens": sum(len(m["content"]) for m in self.messages) // 4
+            "estimated_total_tokens": self.total_tokens
         }
     
     def _count_by_role(self) -> Dict[str, int]:
@@ -271,21 +527,35 @@ class ConversationManager:
     
     @staticmethod
     def list_all_sessions() -> List[Dict[str, Any]]:
-        """List all saved conversation sessions."""
+        """List all saved conversation sessions (including not-yet-imported JSON files)."""
         sessions = []
-        for file_path in CONVERSATIONS_DIR.glob("session_*.json"):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    sessions.append({
-                        "session_id": data.get("session_id"),
-                        "file": file_path.name,
-                        "message_count": len(data.get("messages", [])),
-                        "last_updated": data.get("metadata", {}).get("last_updated"),
-                    })
-            except Exception:
-                continue
-        return sorted(sessions, key=lambda x: x.get("last_updated", ""), reverse=True)
+        conn = _connect()
+        try:
+            # seq runs 0..n-1 per session, so MAX(seq) + 1 is the message count; MAX over
+            # the (session_id, seq) primary key is one index probe instead of a row scan
+            rows = conn.execute(
+                "SELECT s.session_id, s.metadata, "
+                "COALESCE((SELECT MAX(m.seq) FROM messages m WHERE m.session_id = s.session_id) + 1, 0) "
+                "FROM sessions s"
+            ).fetchall()
+        finally:
+            conn.close()
+        for session_id, metadata, count in rows:
+            sessions.append({
+                "session_id": session_id,
+                "file": DB_PATH.name,
+                "message_count": count,
+                "last_updated": _unpack(metadata).get("last_updated"),
+            })
+        
+        known = {s["session_id"] for s in sessions}
+        legacy = [p for p in CONVERSATIONS_DIR.glob("session_*.json")
+                  if p.stem[len("session_"):] not in known]
+        if legacy:
+            # Legacy files are parsed whole; read them concurrently
+            with ThreadPoolExecutor(max_workers=min(8, len(legacy))) as ex:
+                sessions.extend(meta for meta in ex.map(_load_session_meta, legacy) if meta)
+        return sorted(sessions, key=lambda x: x.get("last_updated") or "", reverse=True)
     
     @staticmethod
     def load_session(session_id: str) -> 'ConversationManager':
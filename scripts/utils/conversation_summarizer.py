@@ -26,6 +26,35 @@ Usage:
 import json
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.conversation_manager import compact_history
+
+# New messages needed before incremental_summarize pays for another LLM call
+SUMMARIZE_BATCH = 20
+
+# Shared head of every summary prompt. It is byte-identical across calls and the
+# per-call parts (history, counts, prior summary) follow it, so Gemini's implicit
+# prefix cache can serve it instead of re-billing it on each summary.
+SUMMARY_INSTRUCTIONS = """Summarize the conversation history below concisely while preserving all critical information.
+
+Focus on:
+- Key topics discussed
+- Important questions asked and answers provided
+- Decisions made or conclusions reached
+- Context needed for understanding future messages
+
+Provide a structured summary in JSON format:
+{
+    "summary": "Concise narrative summary of the conversation",
+    "key_topics": ["topic1", "topic2", ...],
+    "important_facts": ["fact1", "fact2", ...],
+    "open_questions": ["question1", "question2", ...],
+    "context_for_continuation": "What an AI agent needs to know to continue this conversation"
+}
+"""
 
 
 class ConversationSummarizer:
@@ -46,7 +75,8 @@ class ConversationSummarizer:
         self, 
         conversation_manager,
         keep_recent: int = 20,
-        compression_ratio: float = 0.2
+        compression_ratio: float = 0.2,
+        history: Optional[List[Dict]] = None
     ) -> str:
         """
         Summarize a conversation, keeping only recent messages + summary.
@@ -55,45 +85,30 @@ class ConversationSummarizer:
             conversation_manager: ConversationManager instance
             keep_recent: Number of recent messages to keep in full
             compression_ratio: Target compression ratio (0.2 = compress to 20% of original)
+            history: The manager's history if the caller already has it (default: get_history())
             
         Returns:
             Summary text
         """
-        messages = conversation_manager.get_history()
+        messages = conversation_manager.get_history() if history is None else history
         
         if len(messages) <= keep_recent:
             return "No summarization needed - conversation is short enough."
         
-        # Split into old and recent
-        old_messages = messages[:-keep_recent]
+        # Split into old and recent; drop status noise / repeats before paying for an LLM call
+        old_messages = compact_history(messages[:-keep_recent])
+        if not old_messages:
+            return "No summarization needed - older messages were all compacted away."
         
         # Create summarization prompt
         conversation_text = self._format_messages_for_summary(old_messages)
         
-        prompt = f"""
-Summarize the following conversation history concisely while preserving all critical information.
-
-Focus on:
-- Key topics discussed
-- Important questions asked and answers provided
-- Decisions made or conclusions reached
-- Context needed for understanding future messages
-
-Original message count: {len(old_messages)}
-Target summary length: {int(len(conversation_text) * compression_ratio)} characters
-
-CONVERSATION TO SUMMARIZE:
-{conversation_text}
-
-Provide a structured summary in JSON format:
-{{
-    "summary": "Concise narrative summary of the conversation",
-    "key_topics": ["topic1", "topic2", ...],
-    "important_facts": ["fact1", "fact2", ...],
-    "open_questions": ["question1", "question2", ...],
-    "context_for_continuation": "What an AI agent needs to know to continue this conversation"
-}}
-"""
+        prompt = (
+            f"{SUMMARY_INSTRUCTIONS}\n"
+            f"CONVERSATION TO SUMMARIZE:\n{conversation_text}\n\n"
+            f"Original message count: {len(old_messages)}\n"
+            f"Target summary length: {int(len(conversation_text) * compression_ratio)} characters\n"
+        )
         
         try:
             print(f"🤖 Summarizing {len(old_messages)} messages...")
@@ -117,6 +132,73 @@ Provide a structured summary in JSON format:
             # Fallback: simple truncation
             return self._simple_summary(old_messages)
     
+    def incremental_summarize(
+        self,
+        conversation_manager,
+        prior_summary: Optional[str],
+        upto_idx: int,
+        keep_recent: int = 10,
+        history: Optional[List[Dict]] = None,
+        batch_tokens: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Fold the messages summarized since the last call into the stored summary.
+        
+        Only history[upto_idx:-keep_recent] is sent to the model, together with the
+        prior summary, so a resume never re-summarizes what is already covered.
+        Fewer than SUMMARIZE_BATCH new messages skips the call and returns the prior
+        summary, unless those messages already hold batch_tokens or more. The result
+        is written back to the manager's metadata as cached_summary / summarized_upto.
+        
+        Args:
+            conversation_manager: ConversationManager instance
+            prior_summary: Summary of history[:upto_idx] (None if there is none yet)
+            upto_idx: Number of leading messages prior_summary already covers
+            keep_recent: Number of recent messages left out of the summary
+            history: The manager's history if the caller already has it (default: get_history())
+            batch_tokens: Summarize a short batch anyway once it is this large (~4 chars/token)
+            
+        Returns:
+            Summary text covering everything but the last keep_recent messages
+        """
+        messages = conversation_manager.get_history() if history is None else history
+        new_upto = len(messages) - keep_recent
+        # History shrank under us (cleared/rewritten): start over
+        if upto_idx > len(messages):
+            prior_summary, upto_idx = None, 0
+        
+        if new_upto - upto_idx < SUMMARIZE_BATCH:
+            # A few huge turns are worth a call; a few short ones aren't
+            span_tokens = sum(len(m["content"]) for m in messages[upto_idx:new_upto]) // 4
+            if new_upto <= upto_idx or batch_tokens is None or span_tokens < batch_tokens:
+                return prior_summary
+        
+        new_turns = compact_history(messages[upto_idx:new_upto])
+        new_text = self._format_messages_for_summary(new_turns)
+        prompt = (
+            f"{SUMMARY_INSTRUCTIONS}\n"
+            f"PRIOR SUMMARY (covers the first {upto_idx} messages):\n{prior_summary or '(none)'}\n\n"
+            f"NEW TURNS:\n{new_text}\n\n"
+            "Update the prior summary so it also covers the new turns.\n"
+        )
+        
+        try:
+            print(f"🤖 Updating summary with {len(new_turns)} new messages...")
+            result = self.client.enrich(prompt, phase="conversation_summary_incremental")
+            if not isinstance(result, dict):
+                result = json.loads(result)
+            summary = self._format_summary(result, new_upto)
+        except Exception as e:
+            print(f"❌ Failed to update summary: {e}")
+            # Keep the stored state; the same turns are retried next time
+            fallback = self.summarize_conversation_simple(new_turns)
+            return f"{prior_summary}\n\n{fallback}" if prior_summary else fallback
+        
+        conversation_manager.metadata["cached_summary"] = summary
+        conversation_manager.metadata["summarized_upto"] = new_upto
+        conversation_manager.save()
+        return summary
+    
     def _format_messages_for_summary(self, messages: List[Dict]) -> str:
         """Format messages for summarization."""
         formatted = []
@@ -185,7 +267,8 @@ Provide a structured summary in JSON format:
     def create_context_optimized_history(
         self,
         conversation_manager,
-        max_tokens: int = 50000
+        max_tokens: int = 50000,
+        history: Optional[List[Dict]] = None
     ) -> Dict[str, Any]:
         """
         Create an optimized conversation history that fits within token limits.
@@ -193,12 +276,13 @@ Provide a structured summary in JSON format:
         Args:
             conversation_manager: ConversationManager instance
             max_tokens: Maximum tokens to use (rough estimate: 1 token ≈ 4 chars)
+            history: The manager's history if the caller already has it (default: get_history())
             
         Returns:
             Optimized context dictionary
         """
         max_chars = max_tokens * 4
-        messages = conversation_manager.get_history()
+        messages = conversation_manager.get_history() if history is None else history
         
         # Strategy: Keep system messages + summary + recent messages
         system_messages = [m for m in messages if m['role'] == 'system']
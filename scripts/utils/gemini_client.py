@@ -12,10 +12,13 @@ Features:
   - Cost tracking and optimization
 """
 
+import os
 import json
 import time
+import hashlib
+import threading
 import warnings
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 
@@ -33,7 +36,7 @@ from config import (
     GEMINI_TEMPERATURE_EXTRACT,
     GEMINI_TEMPERATURE_RESTRUCTURE,
     GEMINI_TEMPERATURE_ENRICH,
-    GEMINI_DELAY_BETWEEN_REQUESTS,
+    GEMINI_DELAY_NS,
     GEMINI_API_TIMEOUT,
     PROJECT_ROOT,
     EXTRACTED_DIR,
@@ -47,6 +50,66 @@ except ImportError:
     CACHING_AVAILABLE = False
     print("⚠️  Context caching not available (utils.context_cache not found)")
 
+# ─── Uploaded-file reuse across runs ────────────────────────
+# (api key fingerprint):(sha256 of PDF) -> {"name", "expiration"}; uploads
+# still valid for UPLOAD_REUSE_MARGIN are fetched with get_file, not re-sent
+GEMINI_FILES_MANIFEST = PROJECT_ROOT / "logs" / "gemini_files.json"
+UPLOAD_REUSE_MARGIN = timedelta(hours=1)
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_files_manifest():
+    try:
+        return json.loads(GEMINI_FILES_MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_files_manifest(manifest):
+    GEMINI_FILES_MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    tmp = GEMINI_FILES_MANIFEST.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, GEMINI_FILES_MANIFEST)
+
+
+def _update_files_manifest(update):
+    """Apply `update(manifest)` and save, holding a lock file so that parallel
+    workers don't overwrite each other's entries. A lock older than 30s is
+    treated as left behind by a crashed process and broken."""
+    lock = GEMINI_FILES_MANIFEST.with_suffix(".lock")
+    GEMINI_FILES_MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.time() + 30
+    while True:
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - lock.stat().st_mtime > 30:
+                    lock.unlink()
+                    continue
+            except OSError:
+                continue
+            if time.time() > deadline:
+                raise OSError(f"timed out waiting for {lock}")
+            time.sleep(0.05)
+    try:
+        manifest = _load_files_manifest()
+        update(manifest)
+        _save_files_manifest(manifest)
+    finally:
+        try:
+            lock.unlink()
+        except OSError:
+            pass
+
 # ─── Cost Estimates (per 1M tokens, free tier = $0) ────────
 COST_PER_1M_INPUT = {
     "gemini-2.0-flash": 0.10, "gemini-2.5-flash": 0.15,
@@ -72,10 +135,23 @@ class GeminiClient:
     # Shared cache across all instances in the same process
     # Maps absolute path string -> Gemini File object
     _shared_uploaded_files = {}
+    # Paths this process uploaded itself -> their GEMINI_FILES_MANIFEST key.
+    # Uploads reused from the manifest may still be in use elsewhere, so
+    # delete_uploads() leaves them alone.
+    _own_uploads = {}
+    # Per-path locks so concurrent phases don't upload the same PDF twice
+    _upload_locks = {}
     
+    # Long-lived workers (parallel_worker --serve) set this so each phase's
+    # cleanup() leaves uploads for the next chapter and for later runs
+    keep_uploads = False
+
     # Track global TPM across all instances in this process
     _global_usage_window = [] # List of (timestamp, tokens)
     _tpm_limit = 1000000
+    # Guards the usage window and RPM slot bookkeeping in _rate_limit
+    _rate_lock = threading.Lock()
+    _last_request_ns = 0  # time.monotonic_ns() of the latest reserved call slot
 
     def __init__(self, enable_caching: bool = True, conversation_id: str = None):
         """
@@ -91,7 +167,6 @@ class GeminiClient:
                 "Then add to .env: GEMINI_API_KEY=your_key_here"
             )
         genai.configure(api_key=GEMINI_API_KEY)
-        self._last_request_time = 0
         self._usage_log = []
         self._total_input_tokens = 0
         self._total_output_tokens = 0
@@ -145,11 +220,22 @@ class GeminiClient:
         return self.extract_heavy(prompt, pdf_file, "extract", max_retries)
 
     def upload_pdf(self, pdf_path):
-        """Upload PDF to Gemini file API. Cached per path."""
+        """Upload PDF to Gemini file API. Cached per path, and across runs by content."""
         pdf_path = str(pdf_path)
+        with self._upload_locks.setdefault(pdf_path, threading.Lock()):
+            return self._upload_pdf(pdf_path)
+
+    def _upload_pdf(self, pdf_path):
         if pdf_path in self._shared_uploaded_files:
             return self._shared_uploaded_files[pdf_path]
-        from pathlib import Path
+        # Files belong to the key's project, so the key is part of the cache key
+        key_fp = hashlib.sha256(GEMINI_API_KEY.encode("utf-8")).hexdigest()[:12]
+        manifest_key = f"{key_fp}:{_file_digest(pdf_path)}"
+        reused = self._reuse_upload(manifest_key)
+        if reused is not None:
+            print(f"  ♻️  Reusing uploaded PDF: {Path(pdf_path).name}")
+            self._shared_uploaded_files[pdf_path] = reused
+            return reused
         logs_dir = Path(__file__).resolve().parents[2] / "logs"
         logs_dir.mkdir(parents=True, exist_ok=True)
         ops_path = logs_dir / "operations.log"
@@ -167,6 +253,8 @@ class GeminiClient:
                 of.write(f"{datetime.now().isoformat()}\tUPLOAD_FAILED\tfile={Path(pdf_path).name}\tstate={uploaded.state.name}\n")
             raise RuntimeError(f"PDF upload failed: {uploaded.state.name}")
         self._shared_uploaded_files[pdf_path] = uploaded
+        self._own_uploads[pdf_path] = manifest_key
+        self._record_upload(manifest_key, uploaded)
         print(f"  ✅ PDF ready")
         with open(ops_path, "a", encoding="utf-8") as of:
             of.write(f"{datetime.now().isoformat()}\tUPLOAD_COMPLETE\tfile={Path(pdf_path).name}\n")
@@ -407,34 +495,40 @@ class GeminiClient:
                     print(f"  ⚠️  API error (attempt {attempt+1}/{max_retries}): {err_msg[:80]}")
                 
                 if attempt < max_retries - 1:
-                    time.sleep(delay)
+                    # Backoff wakes immediately if Ctrl+C was pressed
+                    if config.INTERRUPT_REQUESTED.wait(delay):
+                        raise KeyboardInterrupt("Interrupt requested during retry backoff")
                 else:
                     raise
 
     def _rate_limit(self, incoming_tokens=450000):
-        """Dynamic rate limiting based on Tokens Per Minute (TPM)."""
-        now = time.time()
-        # Clean window
-        self._global_usage_window = [u for u in self._global_usage_window if now - u[0] < 60]
-        
-        current_tpm = sum(u[1] for u in self._global_usage_window)
-        
-        # If adding this call would exceed TPM, wait until the oldest call falls out of the window
-        while current_tpm + incoming_tokens > self._tpm_limit:
-            wait_time = 60 - (now - self._global_usage_window[0][0]) + 1
-            if wait_time > 0:
-                print(f"     ⏳ TPM Limit reached ({current_tpm:,} + {incoming_tokens:,} > {self._tpm_limit:,}). Waiting {int(wait_time)}s...")
-                time.sleep(wait_time)
-            
-            now = time.time()
-            self._global_usage_window = [u for u in self._global_usage_window if now - u[0] < 60]
-            current_tpm = sum(u[1] for u in self._global_usage_window)
+        """Dynamic rate limiting based on Tokens Per Minute (TPM).
 
-        # Also respect the base RPM delay
-        elapsed = time.time() - self._last_request_time
-        if elapsed < GEMINI_DELAY_BETWEEN_REQUESTS:
-            time.sleep(GEMINI_DELAY_BETWEEN_REQUESTS - elapsed)
-        self._last_request_time = time.time()
+        Both budgets are process-wide, shared by every client instance and thread:
+        the TPM check and the next RPM slot are taken under _rate_lock, the
+        waiting is done outside it.
+        """
+        window = self._global_usage_window
+        while True:
+            with self._rate_lock:
+                now = time.time()
+                # Clean window
+                window[:] = [u for u in window if now - u[0] < 60]
+                current_tpm = sum(u[1] for u in window)
+                if not window or current_tpm + incoming_tokens <= self._tpm_limit:
+                    # Reserve the next RPM slot (integer ns on a monotonic clock)
+                    slot_ns = max(time.monotonic_ns(), self._last_request_ns + GEMINI_DELAY_NS)
+                    GeminiClient._last_request_ns = slot_ns
+                    break
+                # Adding this call would exceed TPM: wait until the oldest call falls out of the window
+                wait_time = 60 - (now - window[0][0]) + 1
+            print(f"     ⏳ TPM Limit reached ({current_tpm:,} + {incoming_tokens:,} > {self._tpm_limit:,}). Waiting {int(wait_time)}s...")
+            if config.INTERRUPT_REQUESTED.wait(wait_time):
+                raise KeyboardInterrupt("Interrupt requested while waiting for TPM budget")
+
+        delay_ns = slot_ns - time.monotonic_ns()
+        if delay_ns > 0:
+            time.sleep(delay_ns / 1e9)
 
     # ─── Cost tracking ──────────────────────────────────────
 
@@ -519,10 +613,60 @@ class GeminiClient:
             }, f, indent=2)
         print(f"  💾 Log: {path.relative_to(PROJECT_ROOT)}")
 
-    def cleanup(self):
-        for path, up in self._uploaded_files.items():
+    @staticmethod
+    def _reuse_upload(manifest_key):
+        """An earlier run's upload of the same PDF, if still ACTIVE and not about to expire."""
+        entry = _load_files_manifest().get(manifest_key)
+        if not entry:
+            return None
+        try:
+            expires = datetime.fromisoformat(entry["expiration"])
+            if expires - datetime.now(timezone.utc) < UPLOAD_REUSE_MARGIN:
+                return None
+            uploaded = genai.get_file(entry["name"])
+        except Exception:
+            return None
+        return uploaded if uploaded.state.name == "ACTIVE" else None
+
+    @staticmethod
+    def _record_upload(manifest_key, uploaded):
+        expiration = getattr(uploaded, "expiration_time", None)
+        if expiration is None:
+            return
+        if expiration.tzinfo is None:
+            expiration = expiration.replace(tzinfo=timezone.utc)
+        entry = {"name": uploaded.name, "expiration": expiration.isoformat()}
+        try:
+            _update_files_manifest(lambda manifest: manifest.update({manifest_key: entry}))
+        except OSError:
+            pass  # reuse is an optimization; the upload itself succeeded
+
+    @classmethod
+    def delete_uploads(cls):
+        """Delete every PDF this process uploaded from the Gemini file API.
+
+        Uploads reused from an earlier run are only forgotten, not deleted.
+        """
+        for path in cls._own_uploads:
+            up = cls._shared_uploaded_files.get(path)
             try:
                 genai.delete_file(up.name)
             except Exception:
                 pass
-        self._uploaded_files.clear()
+        cls._shared_uploaded_files.clear()
+        if cls._own_uploads:
+            keys = list(cls._own_uploads.values())
+            cls._own_uploads.clear()
+
+            def drop(manifest):
+                for key in keys:
+                    manifest.pop(key, None)
+            try:
+                _update_files_manifest(drop)
+            except OSError:
+                pass
+
+    def cleanup(self):
+        if self.keep_uploads:
+            return
+        self.delete_uploads()